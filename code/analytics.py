@@ -0,0 +1,233 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+
+from settings import ANALYTICS_DB, ANALYTICS_FLUSH_INTERVAL, ANALYTICS_MIN_ABORTED_DWELL
+from game_clock import game_clock
+from game_log import get_logger
+
+log = get_logger(__name__)
+
+# This code is used for keeping the therapy metrics of every session: confirmed gestures per class,
+# dwell times, aborted dwells, hearts collected and time spent per level.
+# The camera and the level only update small in-memory aggregates. A worker thread writes whatever
+# changed to a local SQLite database every few seconds in one transaction (WAL mode, so summaries can
+# be read while the game writes). Summaries per patient and date range are read from the database.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    patient_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_patient ON sessions (patient_id, started_at);
+CREATE TABLE IF NOT EXISTS gesture_stats (
+    session_id INTEGER NOT NULL REFERENCES sessions (id),
+    label INTEGER NOT NULL,
+    confirmed INTEGER NOT NULL,
+    aborted INTEGER NOT NULL,
+    dwell_seconds REAL NOT NULL,
+    PRIMARY KEY (session_id, label)
+);
+CREATE TABLE IF NOT EXISTS level_runs (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions (id),
+    level_key TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    seconds REAL NOT NULL,
+    hearts INTEGER NOT NULL,
+    completed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS level_runs_by_session ON level_runs (session_id);
+"""
+
+
+def connect(db_path):
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent, a crash loses at most the last flush
+    return connection
+
+
+def _timestamp(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if not isinstance(value, datetime) and isinstance(value, date):
+        value = datetime.combine(value, datetime.min.time())
+    return value.timestamp()
+
+
+class SessionAnalytics:
+    def __init__(self, db_path=ANALYTICS_DB, flush_interval=ANALYTICS_FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.patient_id = None
+        self.session_id = None
+        self.started_at = None
+        self.gestures = {}       # label -> [confirmed, aborted, dwell seconds of confirmed gestures]
+        self.dirty_labels = set()
+        self.level_run = None    # The level being played: {'level_key', 'started_at', 'clock_start', 'hearts'}
+        self.finished_runs = []  # Level runs waiting for the next flush
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer = None
+
+    # --- Recording, called from the game loop: memory only, never touches the database ---
+    # Nothing is kept while no session is open (analytics off, start() failed, or after stop()),
+    # since there would be no writer to ever save it.
+
+    @property
+    def recording(self):
+        return self._writer is not None
+
+    def gesture_confirmed(self, label, dwell_seconds):
+        if not self.recording:
+            return
+        with self._lock:
+            stats = self.gestures.setdefault(label, [0, 0, 0.0])
+            stats[0] += 1
+            stats[2] += dwell_seconds
+            self.dirty_labels.add(label)
+
+    def dwell_aborted(self, label, held_seconds):
+        """A gesture held for a while and then dropped before its dwell time was reached."""
+        if not self.recording or held_seconds < ANALYTICS_MIN_ABORTED_DWELL:
+            return  # Short flickers of the classifier are not attempts
+        with self._lock:
+            self.gestures.setdefault(label, [0, 0, 0.0])[1] += 1
+            self.dirty_labels.add(label)
+
+    def level_started(self, level_key):
+        self.level_finished(completed=False)  # A level left without finishing it
+        if not self.recording:
+            return
+        self.level_run = {'level_key': level_key, 'started_at': time.time(), 'clock_start': game_clock.now(), 'hearts': 0}
+
+    def heart_collected(self):
+        if self.level_run:
+            self.level_run['hearts'] += 1
+
+    def level_finished(self, completed):
+        run, self.level_run = self.level_run, None
+        if run is None:
+            return
+        row = (run['level_key'], run['started_at'], game_clock.now() - run['clock_start'], run['hearts'], int(completed))
+        with self._lock:
+            self.finished_runs.append(row)
+
+    # --- Writing, on the worker thread ---
+
+    def start(self, patient_id):
+        """Opens a new session for a patient and starts the background writer."""
+        if self._writer:
+            return
+        self.patient_id = patient_id
+        self.started_at = time.time()
+        try:
+            connection = connect(self.db_path)
+            with connection:
+                connection.executescript(SCHEMA)
+                self.session_id = connection.execute(
+                    "INSERT INTO sessions (patient_id, started_at) VALUES (?, ?)", (patient_id, self.started_at)).lastrowid
+            connection.close()
+        except sqlite3.Error as e:
+            log.error("Could not open analytics database %s: %s. Session metrics will not be saved.", self.db_path, e)
+            return
+        self._stopping = False
+        self._writer = threading.Thread(target=self._run_writer, name='analytics-writer', daemon=True)
+        self._writer.start()
+        log.info("Analytics session started", extra={'fields': {'patient': patient_id, 'session': self.session_id}})
+
+    def _take_pending(self):
+        with self._lock:
+            gestures = [(label, *self.gestures[label]) for label in self.dirty_labels]
+            self.dirty_labels = set()
+            runs, self.finished_runs = self.finished_runs, []
+        return gestures, runs
+
+    def _run_writer(self):
+        connection = connect(self.db_path)
+        try:
+            while True:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._flush(connection, ended=self._stopping)
+                if self._stopping:
+                    return
+        finally:
+            connection.close()
+
+    def _flush(self, connection, ended=False):
+        gestures, runs = self._take_pending()
+        if not gestures and not runs and not ended:
+            return
+        try:
+            with connection:  # One transaction per flush
+                connection.executemany(
+                    "INSERT INTO gesture_stats (session_id, label, confirmed, aborted, dwell_seconds) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (session_id, label) DO UPDATE SET confirmed = excluded.confirmed, "
+                    "aborted = excluded.aborted, dwell_seconds = excluded.dwell_seconds",
+                    [(self.session_id, int(label), confirmed, aborted, dwell) for label, confirmed, aborted, dwell in gestures])
+                connection.executemany(
+                    "INSERT INTO level_runs (session_id, level_key, started_at, seconds, hearts, completed) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(self.session_id, *run) for run in runs])
+                if ended:
+                    connection.execute("UPDATE sessions SET ended_at = ? WHERE id = ?", (time.time(), self.session_id))
+        except sqlite3.Error as e:
+            log.error("Could not write session analytics: %s", e)
+
+    def flush(self):
+        """Asks the writer to save what was recorded so far without waiting for the next interval."""
+        self._wake.set()
+
+    def stop(self):
+        """Closes the open level run and the session, then waits for the last write."""
+        if not self._writer:
+            return
+        self.level_finished(completed=False)
+        self._stopping = True
+        self._wake.set()
+        self._writer.join()
+        self._writer = None
+
+
+def summary(patient_id, start=None, end=None, db_path=ANALYTICS_DB):
+    """
+    Returns the metrics of a patient's sessions started between start and end (datetime, date or
+    epoch seconds, both optional): gesture counts and mean dwell per class, and runs per level.
+    Without a database yet the summary is empty, and no database file is created for it.
+    """
+    if not os.path.exists(db_path):
+        return {'patient_id': patient_id, 'sessions': 0, 'first_session': None, 'last_session': None,
+                'gestures': {}, 'levels': {}}
+    where = "s.patient_id = ? AND s.started_at >= ? AND s.started_at < ?"
+    args = (patient_id, _timestamp(start) or 0, _timestamp(end) or float('inf'))
+    connection = connect(db_path)
+    try:
+        connection.executescript(SCHEMA)  # A database left empty by an earlier failed start has no tables
+        sessions, first, last = connection.execute(
+            f"SELECT COUNT(*), MIN(started_at), MAX(started_at) FROM sessions s WHERE {where}", args).fetchone()
+        gestures = {
+            label: {'confirmed': confirmed, 'aborted': aborted, 'mean_dwell_seconds': dwell / confirmed if confirmed else None}
+            for label, confirmed, aborted, dwell in connection.execute(
+                "SELECT g.label, SUM(g.confirmed), SUM(g.aborted), SUM(g.dwell_seconds) FROM gesture_stats g "
+                f"JOIN sessions s ON s.id = g.session_id WHERE {where} GROUP BY g.label ORDER BY g.label", args)
+        }
+        levels = {
+            level_key: {'runs': runs, 'completed': completed, 'hearts': hearts, 'total_seconds': seconds,
+                        'mean_seconds': seconds / runs}
+            for level_key, runs, completed, hearts, seconds in connection.execute(
+                "SELECT r.level_key, COUNT(*), SUM(r.completed), SUM(r.hearts), SUM(r.seconds) FROM level_runs r "
+                f"JOIN sessions s ON s.id = r.session_id WHERE {where} GROUP BY r.level_key ORDER BY r.level_key", args)
+        }
+    finally:
+        connection.close()
+    return {'patient_id': patient_id, 'sessions': sessions, 'first_session': first, 'last_session': last,
+            'gestures': gestures, 'levels': levels}
+
+
+session_analytics = SessionAnalytics()
@@ -0,0 +1,68 @@
+import os
+
+import pygame
+from settings import ANIMATION_FRAME_MS, FADED_ALPHA
+from assets import asset_manager
+
+# This code is used for loading character animations once and sharing them between every instance.
+# Each status folder (down, down_idle, left_attack, ...) is read in sorted order through the asset
+# cache, and the flipped and faded variants are prepared up front, so choosing the frame to draw is
+# an index into a tuple and never creates a surface.
+
+_animation_cache = {}  # character folder -> AnimationSet
+
+# A status without its own folder can be drawn as the mirror image of this one
+MIRRORED_STATUS = {'left': 'right', 'right': 'left'}
+
+
+def _faded(surface):
+    faded = surface.copy()
+    faded.set_alpha(FADED_ALPHA)
+    return faded
+
+
+class AnimationSet:
+    def __init__(self, root, frame_ms=ANIMATION_FRAME_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.frames = {}    # status -> tuple of frames
+        for status in sorted(os.listdir(root)):
+            if os.path.isdir(os.path.join(root, status)):
+                frames = tuple(asset_manager.folder(os.path.join(root, status).replace('\\', '/')))
+                if frames:
+                    self.frames[status] = frames
+        self.flipped = {status: tuple(pygame.transform.flip(frame, True, False) for frame in frames)
+                        for status, frames in self.frames.items()}
+        self.faded = {status: tuple(_faded(frame) for frame in frames) for status, frames in self.frames.items()}
+        self.faded_flipped = {status: tuple(_faded(frame) for frame in frames) for status, frames in self.flipped.items()}
+
+        # Statuses with no folder of their own are filled in from their mirrored direction
+        for status in list(self.frames):
+            direction, _, suffix = status.partition('_')
+            mirror = MIRRORED_STATUS.get(direction)
+            mirrored_status = f"{mirror}_{suffix}" if suffix else mirror
+            if mirror and mirrored_status not in self.frames:
+                self.frames[mirrored_status] = self.flipped[status]
+                self.flipped[mirrored_status] = self.frames[status]
+                self.faded[mirrored_status] = self.faded_flipped[status]
+                self.faded_flipped[mirrored_status] = self.faded[status]
+
+    def __contains__(self, status):
+        return status in self.frames
+
+    def frame(self, status, tick, flipped=False, faded=False):
+        """Returns the frame of status shown at tick (milliseconds), looping over its frames."""
+        if faded:
+            frames = (self.faded_flipped if flipped else self.faded)[status]
+        else:
+            frames = (self.flipped if flipped else self.frames)[status]
+        return frames[(tick // self.frame_ms) % len(frames)]
+
+
+def load_animation_set(root):
+    """Returns the shared AnimationSet of a character folder, loading it the first time."""
+    animation_set = _animation_cache.get(root)
+    if animation_set is None:
+        animation_set = AnimationSet(root)
+        _animation_cache[root] = animation_set
+    return animation_set
@@ -0,0 +1,173 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+from settings import ASSET_CACHE_BUDGET, TEXT_CACHE_SIZE
+from game_log import get_logger
+
+log = get_logger(__name__)
+
+# This code is used for loading images once and sharing them between levels, menus and UI.
+# Every image is loaded and converted one time, scaled variants are cached by (path, size),
+# and the least recently used surfaces are evicted when the memory budget is exceeded.
+# Fonts are cached by (path, size) and rendered text by (font, text, color, antialias).
+
+
+class AssetManager:
+    def __init__(self, budget_bytes=ASSET_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self._surfaces = OrderedDict()  # (path, size, alpha) -> Surface, oldest first
+        self._folders = {}              # folder path -> sorted list of image paths
+        self._decoded = {}              # path -> decoded but not yet converted Surface (from preload)
+        self._lock = threading.Lock()
+        self.used_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._fonts = {}               # (path, size) -> Font
+        self._texts = OrderedDict()    # (font, text, color, antialias) -> Surface, oldest first
+        self.text_cache_size = TEXT_CACHE_SIZE
+        self.text_hits = 0
+        self.text_misses = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        """Approximate memory used by the pixel data of a surface."""
+        return surface.get_pitch() * surface.get_height()
+
+    def _get(self, key):
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+        return surface
+
+    def _put(self, key, surface):
+        self.misses += 1
+        self._surfaces[key] = surface
+        self.used_bytes += self.surface_bytes(surface)
+        self._evict(keep=key)
+        return surface
+
+    def _evict(self, keep=None):
+        """Drops least recently used surfaces until the cache fits the budget."""
+        while self.used_bytes > self.budget_bytes and len(self._surfaces) > 1:
+            key = next(iter(self._surfaces))
+            if key == keep:
+                break
+            surface = self._surfaces.pop(key)
+            self.used_bytes -= self.surface_bytes(surface)
+            self.evictions += 1
+
+    def image(self, path, alpha=True):
+        """Returns the converted image at path, loading it only on the first request."""
+        key = (path, None, alpha)
+        surface = self._get(key)
+        if surface is None:
+            with self._lock:
+                surface = self._decoded.pop(path, None)
+            if surface is None:
+                surface = pygame.image.load(path)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            surface = self._put(key, surface)
+        return surface
+
+    def scaled(self, path, size, alpha=True):
+        """Returns the image at path scaled to size, cached per (path, size)."""
+        size = (int(size[0]), int(size[1]))
+        key = (path, size, alpha)
+        surface = self._get(key)
+        if surface is None:
+            surface = self._put(key, pygame.transform.scale(self.image(path, alpha), size))
+        return surface
+
+    def folder_paths(self, path):
+        """Returns the image paths in a folder, sorted by file name so indices are stable."""
+        paths = self._folders.get(path)
+        if paths is None:
+            paths = []
+            for root, _, img_files in os.walk(path):
+                for image in sorted(img_files):
+                    if not image.startswith('.'):
+                        paths.append(os.path.join(root, image).replace('\\', '/'))
+            paths.sort()
+            self._folders[path] = paths
+        return paths
+
+    def folder(self, path, alpha=True):
+        """Returns every image in a folder, sorted by file name so indices are stable."""
+        return [self.image(image_path, alpha) for image_path in self.folder_paths(path)]
+
+    def is_loaded(self, path):
+        return (path, None, True) in self._surfaces or (path, None, False) in self._surfaces
+
+    def preload(self, paths):
+        """
+        Decodes image files without converting them, so it is safe to call from a worker thread.
+        The main thread converts them on their first image() request instead of reading the disk.
+        """
+        for path in paths:
+            if self.is_loaded(path) or path in self._decoded:
+                continue
+            try:
+                surface = pygame.image.load(path)
+            except (pygame.error, OSError) as e:
+                log.warning("Could not preload %s: %s", path, e)
+                continue
+            with self._lock:
+                self._decoded[path] = surface
+
+    def font(self, path, size):
+        """Returns the font at path in the given size, opening the file only once."""
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            if path and os.path.exists(path):
+                font = pygame.font.Font(path, size)
+            else:
+                font = pygame.font.Font(None, size)
+            self._fonts[key] = font
+        return font
+
+    def text(self, font, text, color, antialias=True):
+        """Returns a rendered text surface, re-rendering only strings not seen recently."""
+        key = (font, text, color, antialias)
+        surface = self._texts.get(key)
+        if surface is not None:
+            self._texts.move_to_end(key)
+            self.text_hits += 1
+            return surface
+
+        self.text_misses += 1
+        surface = font.render(text, antialias, color)
+        self._texts[key] = surface
+        if len(self._texts) > self.text_cache_size:
+            self._texts.popitem(last=False)
+        return surface
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def clear(self):
+        self._surfaces.clear()
+        self._folders.clear()
+        self._texts.clear()
+        with self._lock:
+            self._decoded.clear()
+        self.used_bytes = 0
+
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def text_hit_ratio(self):
+        total = self.text_hits + self.text_misses
+        return self.text_hits / total if total else 0.0
+
+
+# Shared instance used by every level, menu and UI element
+asset_manager = AssetManager()
@@ -0,0 +1,68 @@
+import threading
+
+import pygame
+from settings import SOUND_EFFECTS, MUSIC_FILE, MUSIC_VOLUME, EFFECT_VOLUME
+from game_log import get_logger
+
+log = get_logger(__name__)
+
+# This code is used for all sound in the game.
+# Short effects are decoded once on a worker thread at startup and kept in a bank keyed by name,
+# the background music is streamed from disk by pygame.mixer.music. Playing never waits for anything:
+# an effect that is not decoded yet (or a missing audio device) is simply skipped.
+
+
+class AudioService:
+    def __init__(self, effects=SOUND_EFFECTS):
+        self.effects = dict(effects)  # name -> file path
+        self.sounds = {}              # name -> decoded Sound, filled by the worker thread
+        self._lock = threading.Lock()
+        self._loader = None
+        self.enabled = False
+
+    def start(self):
+        """Starts decoding the sound bank in the background. Call after pygame.init()."""
+        self.enabled = pygame.mixer.get_init() is not None
+        if not self.enabled:
+            log.warning("No audio device, the game runs without sound.")
+            return
+        self._loader = threading.Thread(target=self._load_bank, name='sound-bank', daemon=True)
+        self._loader.start()
+
+    def _load_bank(self):
+        for name, path in self.effects.items():
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, OSError) as e:
+                log.error("Could not load sound %s: %s", path, e)
+                continue
+            sound.set_volume(EFFECT_VOLUME)
+            with self._lock:
+                self.sounds[name] = sound
+
+    def is_loaded(self, name):
+        return name in self.sounds
+
+    def play(self, name):
+        """Plays an effect on a free channel and returns immediately."""
+        sound = self.sounds.get(name)
+        if sound is not None:
+            sound.play()
+
+    def play_music(self, path=MUSIC_FILE, volume=MUSIC_VOLUME):
+        """Streams a music file in a loop, only its header is read here."""
+        if not self.enabled:
+            return
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(-1)
+        except pygame.error as e:
+            log.error("Could not play music %s: %s", path, e)
+
+    def stop_music(self):
+        if self.enabled:
+            pygame.mixer.music.stop()
+
+
+audio_service = AudioService()
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pygame
+from settings import TILESIZE
+from utils import import_csv_layout
+from level.level_spec import load_level_specs
+from level.map_compiler import load_layers, clear_memory_cache
+
+# The hot paths measured by run_benchmarks.py. Every case group is a generator of (name, callable)
+# pairs and does its own setup, the callable is what gets timed. The game modules are imported inside
+# the groups, so a group whose dependencies are not installed (the camera stack) raises ImportError
+# there and is reported as skipped instead of stopping the whole run.
+
+MODEL_DIR = 'model'
+
+
+def _landmarks(seed=0):
+    """A plausible hand: 21 landmarks spread around a wrist, like one MediaPipe result."""
+    rng = np.random.default_rng(seed)
+    return np.vstack(([0.5, 0.8, 0.0], rng.uniform((0.3, 0.3, -0.1), (0.7, 0.75, 0.1), (20, 3))))
+
+
+def gesture_cases():
+    from camera import HandGestureCamera
+    # Only the feature code is needed, so the camera and model are not opened
+    camera = HandGestureCamera.__new__(HandGestureCamera)
+    landmarks = _landmarks()
+    yield 'engineer_features', lambda: camera.engineer_features(landmarks)
+
+
+def model_cases():
+    from tensorflow.keras.models import load_model
+    for file_name in sorted(os.listdir(MODEL_DIR)):
+        if not file_name.endswith('.keras'):
+            continue
+        model = load_model(os.path.join(MODEL_DIR, file_name))
+        model_input = np.zeros((1,) + tuple(size or 1 for size in model.input_shape[1:]), dtype=np.float32)
+        # predict() is what the camera calls, a direct call skips its per-call setup
+        yield f'model_predict[{file_name}]', lambda model=model, x=model_input: model.predict(x, verbose=0)
+        yield f'model_call[{file_name}]', lambda model=model, x=model_input: model(x, training=False)
+
+
+def _load_layers_from_disk(layers):
+    clear_memory_cache()  # Otherwise every call after the first is only a lookup in memory
+    return load_layers(layers)
+
+
+def map_cases():
+    from level.level import Level
+    from level.level_data import load_level_data
+    for spec in load_level_specs():
+        paths = list(spec.layers.values())
+        yield f'import_csv_layout[{spec.key}]', lambda paths=paths: [import_csv_layout(path) for path in paths]
+        yield f'load_layers[{spec.key}]', lambda layers=spec.layers: _load_layers_from_disk(layers)
+        level_data = load_level_data(spec)
+        # Building a Level runs create_map over the prepared layers and images
+        yield f'create_map[{spec.key}]', lambda spec=spec, level_data=level_data: Level(
+            spec, camera_instance=None, screen_surface=pygame.display.get_surface(), font_renderer=None, level_data=level_data)
+        # Restarting a pooled level is the path that replaces create_map when a level is played again
+        level = Level(spec, camera_instance=None, screen_surface=pygame.display.get_surface(), font_renderer=None, level_data=level_data)
+        yield f'level_reset[{spec.key}]', level.reset
+
+
+def _built_levels():
+    from level.level import Level
+    for spec in load_level_specs():
+        yield spec, Level(spec, camera_instance=None, screen_surface=pygame.display.get_surface(), font_renderer=None)
+
+
+def draw_cases():
+    for spec, level in _built_levels():
+        yield f'custom_draw[{spec.key}]', lambda level=level: level.visible_sprites.custom_draw(pygame.display.get_surface(), level.player)
+        yield f'ui_display[{spec.key}]', lambda level=level: level.ui.display(
+            pygame.display.get_surface(), level.player, level.hearts_to_collect, level.guidance())
+
+
+def collision_cases():
+    for spec, level in _built_levels():
+        player = level.player
+        if player is None:
+            continue
+        # A step in every direction, on the tile grid (grid lookup) and half a tile off it (hitbox fallback)
+        steps = [player.hitbox.move(dx * TILESIZE, dy * TILESIZE) for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0))]
+        off_grid = [hitbox.move(TILESIZE // 2, TILESIZE // 2) for hitbox in steps]
+        yield f'check_obstacle_collision[{spec.key}]', lambda steps=steps, player=player: [player.check_obstacle_collision(hitbox) for hitbox in steps]
+        yield f'check_obstacle_collision_off_grid[{spec.key}]', lambda steps=off_grid, player=player: [
+            player.check_obstacle_collision(hitbox) for hitbox in steps]
+
+
+CASE_GROUPS = [gesture_cases, model_cases, map_cases, draw_cases, collision_cases]
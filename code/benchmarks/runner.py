@@ -0,0 +1,104 @@
+import gc
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+
+import pygame
+
+# Times the benchmark cases and compares the results with a saved baseline.
+# Each case is run in repeats of enough loops to last at least MIN_REPEAT_SECONDS, with the garbage
+# collector off like timeit, and the median time per call is what gets compared.
+
+MIN_REPEAT_SECONDS = 0.05
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.10  # A case more than 10% slower than its baseline is a regression
+
+
+def time_case(func, repeats=DEFAULT_REPEATS, min_seconds=MIN_REPEAT_SECONDS):
+    """Returns the seconds per call of each repeat, all timed with the garbage collector off."""
+    func()  # Warm-up: caches, lazy imports, first-call setup
+    # Calibration only picks the loop count, its time is not one of the repeats
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+        loops = max(loops * 2, int(loops * min_seconds / max(elapsed, 1e-9)))
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            timings.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return timings
+
+
+def run_benchmarks(groups, name_filter=None, repeats=DEFAULT_REPEATS):
+    """Runs every case of the groups whose name contains name_filter. Returns the results document."""
+    results, skipped = {}, {}
+    for group in groups:
+        try:
+            for name, func in group():
+                if name_filter and name_filter not in name:
+                    continue
+                timings = time_case(func, repeats)
+                results[name] = {
+                    'median_us': statistics.median(timings) * 1e6,
+                    'min_us': min(timings) * 1e6,
+                    'repeats': len(timings),
+                }
+        except ImportError as e:
+            skipped[group.__name__] = str(e)
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'machine': platform.platform(),
+        },
+        'results': results,
+        'skipped': skipped,
+    }
+
+
+def save_results(document, path):
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Returns [(name, baseline us, current us, ratio, verdict)] for the cases in both documents, where
+    verdict is 'regression', 'improvement' or 'ok' depending on the threshold.
+    """
+    rows = []
+    for name, result in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        ratio = result['median_us'] / base['median_us'] if base['median_us'] else float('inf')
+        if ratio > 1 + threshold:
+            verdict = 'regression'
+        elif ratio < 1 - threshold:
+            verdict = 'improvement'
+        else:
+            verdict = 'ok'
+        rows.append((name, base['median_us'], result['median_us'], ratio, verdict))
+    return rows
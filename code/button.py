@@ -1,4 +1,5 @@
 import pygame
+from assets import asset_manager
 
 class Button:
     def __init__(self, pos, text, font, base_color, hover_color):
@@ -6,9 +7,14 @@ class Button:
         self.font = font
         self.base_color = base_color
         self.hover_color = hover_color
-        self.text_surface = self.font.render(self.text, True, self.base_color)
+
+        # Both text variants are rendered once, hovering only swaps between them
+        self.base_surface = asset_manager.text(self.font, self.text, self.base_color)
+        self.hover_surface = asset_manager.text(self.font, self.text, self.hover_color)
+        self.text_surface = self.base_surface
         self.rect = self.text_surface.get_rect(center=pos)
-        
+        self.is_hovered = False
+
         # Create button background
         self.bg_rect = self.rect.inflate(40, 20)
 
@@ -22,6 +28,8 @@ class Button:
         return self.rect.collidepoint(mouse_pos)
 
     def change_color(self, mouse_pos):
-        self.is_hovered = self.rect.collidepoint(mouse_pos)
-        color = self.hover_color if self.is_hovered else self.base_color
-        self.text_surface = self.font.render(self.text, True, color)
+        self.set_hovered(self.rect.collidepoint(mouse_pos))
+
+    def set_hovered(self, hovered):
+        self.is_hovered = hovered
+        self.text_surface = self.hover_surface if self.is_hovered else self.base_surface
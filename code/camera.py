@@ -2,14 +2,20 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-import time
 from tensorflow.keras.models import load_model
 import pygame
 import math 
+from assets import asset_manager
+from game_log import get_logger
+from gesture_input import DwellGestureInput, NO_FRAME
+from profiler import frame_profiler
+
+log = get_logger(__name__)
 
 # This code is used for capturing video from the camera and processing hand gestures using a pre-trained model.
 # It uses OpenCV for video capture and Mediapipe for hand detection and landmark extraction.
 # It also uses TensorFlow for loading the pre-trained model and making predictions.
+# The predictions are turned into confirmed actions by the dwell state machine in gesture_input.py.
 # The camera feed is displayed in a Pygame window, and the detected hand landmarks are drawn on the video frame.
 
 # ==============================================================================
@@ -36,35 +42,25 @@ def calculate_angle(v1, v2):
     return np.arccos(dot_product)
 
 
-class HandGestureCamera:
+class HandGestureCamera(DwellGestureInput):
     def __init__(self):
+        super().__init__()
         self.cap = cv2.VideoCapture(0)
         self.is_camera_available = self.cap.isOpened()
         if not self.is_camera_available:
-            print("Error: Could not open video capture device.")
+            log.error("Could not open video capture device.")
 
         self.hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1, min_detection_confidence=0.7)
         self.model = None
         try:
             self.model = load_model("model/090625_nonearlystop_lr_T_2.keras")
         except Exception as e:
-            print(f"Error loading Keras model: {e}. Gesture recognition will be unavailable.")
+            log.error("Error loading Keras model: %s. Gesture recognition will be unavailable.", e)
             self.is_camera_available = False
 
         self.mp_draw = mp.solutions.drawing_utils
 
-        # --- Dwell Time and State Machine ---
-        self.DWELL_TIME_SECONDS = 3  # How long to hold a gesture to confirm it
-        self.POST_ACTION_COOLDOWN = 0.5 # A short pause after an action to prevent immediate re-triggering
-
-        self._potential_label = None          # The gesture currently being held
-        self._potential_label_start_time = 0  # Timestamp when the potential gesture was first seen
-        
-        self._action_to_consume = None        # The confirmed action label to be fetched by the game
-        
-        self._is_in_cooldown = False          # Flag to indicate if we are in the post-action cooldown phase
-        self._cooldown_end_time = 0           # Timestamp when the cooldown finishes
-        # --- End Dwell Time ---
+        self._placeholders = {}               # Message -> surface shown instead of the camera feed
 
     def engineer_features(self, landmarks_np):
         """
@@ -89,103 +85,55 @@ class HandGestureCamera:
 
         return np.concatenate([normalized_landmarks.flatten(), np.array(angles).flatten()])
 
-    def process(self):
-        """
-        Processes a single camera frame to update the gesture dwell state machine.
-        This should be called once per game loop.
-        """
+    def read_prediction(self):
+        """Reads a camera frame and returns the model's label for it, None when no hand is seen."""
         if not self.is_camera_available or not self.model:
-            return
+            return NO_FRAME
 
-        # Check if we are in a post-action cooldown
-        if self._is_in_cooldown and time.time() < self._cooldown_end_time:
-            return
-        elif self._is_in_cooldown:
-            self._is_in_cooldown = False # Cooldown finished, ready for next gesture
+        with frame_profiler.section('capture'):
+            ret, frame = self.cap.read()
+        if not ret: return NO_FRAME
 
-        ret, frame = self.cap.read()
-        if not ret: return
-
-        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = self.hands.process(image_rgb)
+        with frame_profiler.section('mediapipe'):
+            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = self.hands.process(image_rgb)
         
         current_prediction = None
         if result.multi_hand_landmarks:
             try:
                 # Feature engineering and prediction
-                landmarks_raw_np = np.array([[lm.x, lm.y, lm.z] for lm in result.multi_hand_landmarks[0].landmark])
-                features = self.engineer_features(landmarks_raw_np)
-                model_input = np.reshape(features, (1, 1, -1))
-                prediction = self.model.predict(model_input, verbose=0)
-                current_prediction = np.argmax(prediction)
+                with frame_profiler.section('inference'):
+                    landmarks_raw_np = np.array([[lm.x, lm.y, lm.z] for lm in result.multi_hand_landmarks[0].landmark])
+                    features = self.engineer_features(landmarks_raw_np)
+                    model_input = np.reshape(features, (1, 1, -1))
+                    prediction = self.model.predict(model_input, verbose=0)
+                    current_prediction = int(np.argmax(prediction))
+                frame_profiler.count('inference')
             except Exception as e:
-                print(f"Error during gesture prediction: {e}")
+                log.warning("Error during gesture prediction: %s", e)
                 current_prediction = None
-        
-        # --- State Machine Logic ---
-        # If the current prediction is idle (5), reset everything.
-        if current_prediction == 5 or current_prediction is None:
-            self._potential_label = None
-            self._potential_label_start_time = 0
-            return
-
-        # If the prediction is a new, non-idle gesture
-        if current_prediction != self._potential_label:
-            self._potential_label = current_prediction
-            self._potential_label_start_time = time.time()
-        # If the same gesture is being held
-        else:
-            time_held = time.time() - self._potential_label_start_time
-            # If dwell time is exceeded, confirm the action and start cooldown
-            if time_held >= self.DWELL_TIME_SECONDS:
-                print(f"ACTION CONFIRMED: {self._potential_label}")
-                self._action_to_consume = self._potential_label
-                self._potential_label = None # Reset potential label
-                self._potential_label_start_time = 0
-                self._is_in_cooldown = True
-                self._cooldown_end_time = time.time() + self.POST_ACTION_COOLDOWN
-
-    def consume_action(self):
-        """
-        Called by the game to get a confirmed action. Returns the label then resets.
-        This ensures an action is only processed once.
-        """
-        action = self._action_to_consume
-        if action is not None:
-            self._action_to_consume = None # Consume the action
-        return action
-
-    def get_dwell_progress(self):
-        """
-        Returns the progress of the current dwell timer as a float (0.0 to 1.0).
-        Used by the UI to draw the clock.
-        """
-        if self._potential_label is not None and self._potential_label_start_time > 0:
-            time_held = time.time() - self._potential_label_start_time
-            progress = min(time_held / self.DWELL_TIME_SECONDS, 1.0)
-            return progress
-        return 0.0
+        return current_prediction
 
-    def get_frame(self):
-        """Returns a Pygame surface of the current camera view for display."""
-        if not self.is_camera_available:
+    def get_placeholder(self, message):
+        """Returns a cached grey surface with a message, used when no frame is available."""
+        placeholder = self._placeholders.get(message)
+        if placeholder is None:
             placeholder = pygame.Surface((160, 120))
             placeholder.fill((50, 50, 50))
-            font = pygame.font.Font(None, 20)
-            text = font.render("No Camera", True, (255, 255, 255))
+            text = asset_manager.text(asset_manager.font(None, 20), message, (255, 255, 255))
             text_rect = text.get_rect(center=(80, 60))
             placeholder.blit(text, text_rect)
-            return placeholder
+            self._placeholders[message] = placeholder
+        return placeholder
+
+    def get_frame(self):
+        """Returns a Pygame surface of the current camera view for display."""
+        if not self.is_camera_available:
+            return self.get_placeholder("No Camera")
 
         ret, frame = self.cap.read()
         if not ret:
-            placeholder = pygame.Surface((160, 120))
-            placeholder.fill((50, 50, 50))
-            font = pygame.font.Font(None, 20)
-            text = font.render("Frame Error", True, (255, 255, 255))
-            text_rect = text.get_rect(center=(80, 60))
-            placeholder.blit(text, text_rect)
-            return placeholder
+            return self.get_placeholder("Frame Error")
 
         frame = cv2.flip(frame, 1)
         image_rgb_for_display = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -202,4 +150,4 @@ class HandGestureCamera:
     def release(self):
         if self.is_camera_available and self.cap.isOpened():
             self.cap.release()
-        print("Camera released.")
+        log.info("Camera released.")
@@ -0,0 +1,55 @@
+import argparse
+import sys
+
+import pygame
+from settings import LEVELS_FILE, MAP_BUILD_DIR
+from assets import asset_manager
+from level.level_spec import load_level_specs
+from level.player import PLAYER_IMAGE, PLAYER_HITBOX_INFLATE
+from level.map_artifacts import build_level, write_artifacts
+
+# Offline map build: validates every level in map/levels.json and writes the compiled artifacts.
+# Run it from the repository root after editing a map:  python code/compile_maps.py
+# With --check nothing is written, the exit code is 1 when any level has an error.
+
+
+def image_size(path):
+    # Only the size is needed, so the images are loaded without a display
+    return pygame.image.load(path).get_size()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the level maps and compile them for the game.")
+    parser.add_argument('--levels', default=LEVELS_FILE, help="level definitions file")
+    parser.add_argument('--out', default=MAP_BUILD_DIR, help="directory for the compiled artifacts")
+    parser.add_argument('--check', action='store_true', help="only validate, do not write anything")
+    args = parser.parse_args(argv)
+
+    object_sizes = [image_size(path) for path in asset_manager.folder_paths('graphics/objects')]
+    probe_size = pygame.Rect((0, 0), image_size(PLAYER_IMAGE)).inflate(*PLAYER_HITBOX_INFLATE).size
+
+    reports, layouts_by_level = [], {}
+    for spec in load_level_specs(args.levels):
+        report, layouts = build_level(spec, object_sizes, probe_size)
+        reports.append(report)
+        layouts_by_level[spec.key] = layouts
+
+        status = 'FAILED' if report.errors else 'ok'
+        print(f"{spec.key}: {status}, {report.reachable_hearts}/{len(report.hearts)} hearts reachable, estimated {report.estimated_gestures} gestures")
+        for error in report.errors:
+            print(f"  error: {error}")
+        for warning in report.warnings:
+            print(f"  warning: {warning}")
+
+    failed = [report.spec.key for report in reports if report.errors]
+    if not args.check:
+        manifest = write_artifacts(reports, layouts_by_level, len(object_sizes), probe_size, args.out)
+        print(f"Wrote {len(manifest['levels'])} level(s) to {args.out}")
+    if failed:
+        print(f"{len(failed)} level(s) failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,9 @@ from ui import UI
 from settings import TILESIZE, WIDTH, HITBOX_OFFSET  # Make sure to import HITBOX_OFFSET
 from random import choice
 import sys, os
+from game_log import get_logger
+
+log = get_logger(__name__)
 
 # Import functions from support.py
 def import_csv_layout(path):
@@ -99,23 +102,23 @@ class ItemCollectionLevelBase:
             try:
                 layout_data = import_csv_layout(file_path)
                 layouts[layout_name] = layout_data
-                print(f"✓ Successfully loaded {layout_name} from {file_path} - {len(layout_data)} rows")
+                log.debug("Loaded %s from %s - %d rows", layout_name, file_path, len(layout_data))
                 
                 # Debug: Show first few entries for entities
                 if layout_name == 'entities' and layout_data:
-                    print(f"  First row of entities: {layout_data[0][:10] if len(layout_data[0]) > 10 else layout_data[0]}")
+                    log.debug("First row of entities: %s", layout_data[0][:10])
                     
             except FileNotFoundError:
-                print(f"✗ File not found: {file_path}")
+                log.warning("File not found: %s", file_path)
                 layouts[layout_name] = [[]]  # Empty layout
             except Exception as e:
-                print(f"✗ Error loading {layout_name} from {file_path}: {e}")
+                log.warning("Error loading %s from %s: %s", layout_name, file_path, e)
                 layouts[layout_name] = [[]]  # Empty layout
         
         # Check if we have any valid layouts
         total_data = sum(len(layout) for layout in layouts.values())
         if total_data == 0:
-            print("WARNING: No map data found, creating minimal fallback")
+            log.warning("No map data found, creating minimal fallback")
             # Create proper 2D layout arrays (rows and columns)
             layouts = {
                 'boundary': [
@@ -153,9 +156,9 @@ class ItemCollectionLevelBase:
                 # Scale heart to full tile size
                 heart_image = pygame.transform.scale(heart_image, (TILESIZE, TILESIZE))
                 graphics['heart'] = heart_image
-                print("Heart image loaded and scaled to full tile size")
+                log.debug("Heart image loaded and scaled to full tile size")
             except Exception as e:
-                print(f"Error loading heart image: {e}")
+                log.warning("Error loading heart image: %s", e)
                 # Create a more visible fallback heart image at full tile size
                 heart_surf = pygame.Surface((TILESIZE, TILESIZE))
                 heart_surf.fill((255, 0, 0))  # Red color
@@ -170,11 +173,11 @@ class ItemCollectionLevelBase:
                 ])
                 graphics['heart'] = heart_surf
                 
-            print(f"Loaded {len(graphics['grass'])} grass images")
-            print(f"Loaded {len(graphics['objects'])} object images")
+            log.debug("Loaded %d grass images", len(graphics['grass']))
+            log.debug("Loaded %d object images", len(graphics['objects']))
             
         except Exception as e:
-            print(f"Error loading graphics: {e}")
+            log.warning("Error loading graphics: %s", e)
             # Create fallback graphics
             graphics = {
                 'grass': [pygame.Surface((TILESIZE, TILESIZE))],
@@ -190,7 +193,7 @@ class ItemCollectionLevelBase:
         hearts_found = 0
         
         for style, layout in layouts.items():
-            print(f"\nProcessing {style} layout with {len(layout)} rows")
+            log.debug("Processing %s layout with %d rows", style, len(layout))
             
             for row_index, row in enumerate(layout):
                 for col_index, col in enumerate(row):
@@ -216,7 +219,7 @@ class ItemCollectionLevelBase:
                                         surf = graphics['objects'][0]  # Use first object as fallback
                                     Tile((x, y), [self.visible_sprites, self.obstacle_sprites], 'object', surf)
                                 except ValueError:
-                                    print(f"Invalid object ID in {style}: '{col}' at ({col_index}, {row_index})")
+                                    log.warning("Invalid object ID in %s: '%s' at (%d, %d)", style, col, col_index, row_index)
                                     continue
                             
                         elif style == 'entities':
@@ -225,46 +228,42 @@ class ItemCollectionLevelBase:
                                 if col_int == 394:  # Player spawn point
                                     self.player = Player((x, y), [self.visible_sprites], self.obstacle_sprites)
                                     player_found = True
-                                    print(f"✓ Player created at tile ({col_index}, {row_index}) = world pos ({x}, {y})")
+                                    log.debug("Player created at tile (%d, %d) = world pos (%d, %d)", col_index, row_index, x, y)
                                 elif col_int in [390, 391, 392]:  # Heart spawn points
                                     Heart((x, y), [self.visible_sprites, self.item_sprites], graphics['heart'])
                                     hearts_found += 1
-                                    print(f"✓ Heart created at tile ({col_index}, {row_index}) = world pos ({x}, {y})")
+                                    log.debug("Heart created at tile (%d, %d) = world pos (%d, %d)", col_index, row_index, x, y)
                                 else:
                                     # Debug: Show other entity IDs found
                                     if col_int not in [-1, 0]:  # Don't spam for empty tiles
-                                        print(f"  Found entity ID {col_int} at ({col_index}, {row_index})")
+                                        log.debug("Found entity ID %d at (%d, %d)", col_int, col_index, row_index)
                             except ValueError:
-                                print(f"Invalid entity ID in {style}: '{col}' at ({col_index}, {row_index})")
+                                log.warning("Invalid entity ID in %s: '%s' at (%d, %d)", style, col, col_index, row_index)
                                 continue
 
         # Report what we found
-        print(f"\n=== MAP LOADING SUMMARY ===")
-        print(f"Player found in CSV: {player_found}")
-        print(f"Hearts found in CSV: {hearts_found}")
-        print(f"Total visible sprites: {len(self.visible_sprites)}")
-        print(f"Total obstacle sprites: {len(self.obstacle_sprites)}")
+        log.debug("Map loaded: player found in CSV: %s, hearts found in CSV: %d, visible sprites: %d, obstacle sprites: %d",
+                  player_found, hearts_found, len(self.visible_sprites), len(self.obstacle_sprites))
         
         # Fallback: Create player at default position if not found in map
         if self.player is None:
-            print("WARNING: Player spawn point (394) not found in entities CSV!")
-            print("This could mean:")
-            print("- The entities CSV file doesn't contain '394'")
-            print("- The CSV file path is wrong")
-            print("- The CSV file is corrupted or empty")
+            log.warning("Player spawn point (394) not found in entities CSV")
+            log.debug("This could mean:")
+            log.debug("- The entities CSV file doesn't contain '394'")
+            log.debug("- The CSV file path is wrong")
+            log.debug("- The CSV file is corrupted or empty")
             self.player = Player((100, 100), [self.visible_sprites], self.obstacle_sprites)
-            print("Player created at fallback position (100, 100)")
+            log.debug("Player created at fallback position (100, 100)")
 
         # Create fallback hearts only if none were found in CSV
         if len(self.item_sprites) == 0:
-            print("No hearts found in entities CSV, creating fallback hearts")
+            log.debug("No hearts found in entities CSV, creating fallback hearts")
             heart_positions = [(300, 200), (500, 400), (700, 300)]
             for pos in heart_positions:
                 Heart(pos, [self.visible_sprites, self.item_sprites], graphics['heart'])
-                print(f"Fallback heart created at position {pos}")
+                log.debug("Fallback heart created at position %s", pos)
 
-        print(f"Final map stats - Items: {len(self.item_sprites)}, Player exists: {self.player is not None}")
-        print("===========================")
+        log.debug("Final map stats - Items: %d, Player exists: %s", len(self.item_sprites), self.player is not None)
 
     def check_item_collision(self):
         # Add safety check for player existence
@@ -275,11 +274,11 @@ class ItemCollectionLevelBase:
             if self.player.rect.colliderect(heart.rect):
                 self.collect_heart()
                 heart.kill()
-                print(f"Heart collected! Remaining hearts: {len(self.item_sprites)}")
+                log.debug("Heart collected! Remaining hearts: %d", len(self.item_sprites))
                 
     def collect_heart(self):
         """Handle what happens when a heart is collected"""
-        print("Heart collected!")
+        log.debug("Heart collected!")
         # Add your collection logic here:
         # - Restore health
         # - Play sound effect
@@ -297,13 +296,13 @@ class ItemCollectionLevelBase:
     def run(self):
         # Add safety check for player existence
         if self.player is None:
-            print("Critical Error: Player not initialized properly")
+            log.error("Player not initialized properly")
             # Try to create emergency player
             try:
                 self.player = Player((100, 100), [self.visible_sprites], self.obstacle_sprites)
-                print("Emergency player created")
+                log.debug("Emergency player created")
             except Exception as e:
-                print(f"Failed to create emergency player: {e}")
+                log.error("Failed to create emergency player: %s", e)
                 return
             
         if self.camera and self.show_camera:
@@ -341,11 +340,11 @@ class CameraGroup(pygame.sprite.Group):
         try:
             # self.floor_surf = pygame.image.load('graphics/tilemap/ground.png').convert()
             # self.floor_rect = self.floor_surf.get_rect(topleft=(0, 0))
-            # print("Floor background loaded")
+            # log.debug("Floor background loaded")
             self.floor_surf = None
-            print("Floor background disabled to show CSV map")
+            log.debug("Floor background disabled to show CSV map")
         except Exception as e:
-            print(f"Floor background not found: {e}")
+            log.debug("Floor background not found: %s", e)
             self.floor_surf = None
 
     def custom_draw(self, player):
@@ -7,6 +7,9 @@ from settings import *
 from random import choice
 import sys
 import os
+from game_log import get_logger
+
+log = get_logger(__name__)
 
 # Add camera import with error handling
 try:
@@ -14,7 +17,7 @@ try:
     from camera import HandGestureCamera
     CAMERA_AVAILABLE = True
 except ImportError:
-    print("Camera module not available. Gesture recognition disabled.")
+    log.warning("Camera module not available. Gesture recognition disabled.")
     CAMERA_AVAILABLE = False
 
 class Level1(LevelBase):
@@ -37,7 +40,7 @@ class Level1(LevelBase):
                 self.camera = HandGestureCamera()
                 self.show_camera = True
             except Exception as e:
-                print(f"Failed to initialize camera: {e}")
+                log.error("Failed to initialize camera: %s", e)
                 self.camera = None
                 self.show_camera = False
         else:
@@ -120,7 +123,7 @@ class Level1(LevelBase):
             try:
                 self.camera.process()
             except Exception as e:
-                print(f"Camera processing error: {e}")
+                log.warning("Camera processing error: %s", e)
 
     def run(self):
         # Handle gesture recognition
@@ -153,7 +156,7 @@ class Level1(LevelBase):
                     # Draw camera border
                     pygame.draw.rect(self.screen, (255, 255, 255), camera_rect, 2)
             except Exception as e:
-                print(f"Camera display error: {e}")
+                log.warning("Camera display error: %s", e)
         
         # Toggle camera with C key
         keys = pygame.key.get_pressed()
@@ -0,0 +1,52 @@
+import time
+from settings import UPDATE_RATE, MAX_UPDATES_PER_FRAME
+
+# This code is used for giving the whole game one clock.
+# Gameplay advances in fixed steps of 1 / UPDATE_RATE seconds, however fast or slow frames are drawn.
+# The player's cooldowns and the UI read the simulation time, so a slow frame cannot make a move happen twice.
+# Simulation time falls behind after a stall (see advance()), so the gesture dwell is timed with
+# real_now() instead: a held gesture takes DWELL_TIME_SECONDS of the patient's time however slow the frames are.
+
+
+class GameClock:
+    def __init__(self, update_rate=UPDATE_RATE, max_updates=MAX_UPDATES_PER_FRAME, source=time.monotonic):
+        self.step = 1.0 / update_rate
+        self.max_updates = max_updates
+        self.source = source  # Real time in seconds, replaced by a virtual clock when replaying
+        self.time = 0.0       # Simulation time in seconds, only advanced in whole steps
+        self.accumulator = 0.0
+        self.last_real_time = None
+        self.updates = 0      # Fixed updates run during the last frame
+
+    def now(self):
+        return self.time
+
+    def real_now(self):
+        """Unclamped time of the clock's source in seconds, also virtual while replaying."""
+        return self.source()
+
+    def ticks(self):
+        """Simulation time in milliseconds, the clock's replacement for pygame.time.get_ticks()."""
+        return int(self.time * 1000)
+
+    def advance(self):
+        """
+        Adds the real time since the last frame and yields once per fixed update that is due.
+        After a long stall at most max_updates are run, the rest is dropped instead of piling up.
+        """
+        real_time = self.source()
+        if self.last_real_time is None:
+            self.last_real_time = real_time
+        elapsed = real_time - self.last_real_time
+        self.last_real_time = real_time
+        self.accumulator = min(self.accumulator + elapsed, self.max_updates * self.step)
+
+        self.updates = 0
+        while self.accumulator >= self.step:
+            self.accumulator -= self.step
+            self.time += self.step
+            self.updates += 1
+            yield self.step
+
+
+game_clock = GameClock()
@@ -0,0 +1,104 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+from settings import LOG_LEVEL, LOG_FILE, LOG_RATE_LIMIT, LOG_RATE_WINDOW
+
+# This code is used for all console and file output of the game.
+# Loggers only put records on a queue, a background listener thread does the slow writing, so a
+# message never stalls a frame. Each message template is rate limited, so an error that repeats every
+# frame is shown a few times with a count of what was dropped. Extra structured fields can be passed
+# as extra={'fields': {...}} and are written as key=value pairs after the message.
+
+_listener = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `limit` records per message template every `window` seconds.
+    Records come from the game loop and the worker threads, so the counts are guarded by a lock, and
+    templates whose window ran out are dropped once per window so the table does not keep growing.
+    """
+    def __init__(self, limit=LOG_RATE_LIMIT, window=LOG_RATE_WINDOW):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.counts = {}  # (logger name, template) -> [window start, passed, suppressed]
+        self.lock = threading.Lock()
+        self.last_sweep = time.monotonic()
+
+    def filter(self, record):
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_sweep >= self.window:
+                self._sweep(now)
+            state = self.counts.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self.counts[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.limit:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+    def _sweep(self, now):
+        """Forgets the templates whose window has expired, unless they still have a suppressed count to report."""
+        self.counts = {key: state for key, state in self.counts.items() if state[2] or now - state[0] < self.window}
+        self.last_sweep = now
+
+
+class FieldsFormatter(logging.Formatter):
+    def format(self, record):
+        text = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            text += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f" ({suppressed} similar messages suppressed)"
+        return text
+
+
+def setup_logging(level=LOG_LEVEL, log_file=LOG_FILE):
+    """Routes every logger through a queue to a background writer. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+    formatter = FieldsFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s', '%H:%M:%S')
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Writes out whatever is still queued and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name):
+    return logging.getLogger(name)
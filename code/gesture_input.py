@@ -0,0 +1,106 @@
+from game_clock import game_clock
+from game_log import get_logger
+from analytics import session_analytics
+
+log = get_logger(__name__)
+
+# This code is used for turning a stream of gesture predictions into confirmed actions.
+# A gesture has to be held for DWELL_TIME_SECONDS before it counts, after which there is a short
+# cooldown. Where the predictions come from is up to the subclass: the live camera and model
+# (camera.py) or a recorded session (replay.py). Both run this same state machine on game_clock's real time.
+
+IDLE_LABEL = 5     # Prediction of the model for "no gesture"
+NO_FRAME = 'no frame'  # read_prediction() result when nothing was read, e.g. during the cooldown
+
+
+class DwellGestureInput:
+    def __init__(self):
+        # --- Dwell Time and State Machine ---
+        self.DWELL_TIME_SECONDS = 3  # How long to hold a gesture to confirm it
+        self.POST_ACTION_COOLDOWN = 0.5 # A short pause after an action to prevent immediate re-triggering
+
+        self._potential_label = None          # The gesture currently being held
+        self._potential_label_start_time = None  # Timestamp when the potential gesture was first seen
+
+        self._action_to_consume = None        # The confirmed action label to be fetched by the game
+
+        self._is_in_cooldown = False          # Flag to indicate if we are in the post-action cooldown phase
+        self._cooldown_end_time = 0           # Timestamp when the cooldown finishes
+        # --- End Dwell Time ---
+
+        self.last_prediction = NO_FRAME       # What the last process() call read, kept for recording
+
+    def read_prediction(self):
+        """Returns the predicted label of the current frame, None when no hand was seen, or NO_FRAME."""
+        return NO_FRAME
+
+    def process(self):
+        """
+        Reads a single prediction and updates the gesture dwell state machine.
+        This should be called once per game loop.
+        """
+        self.last_prediction = NO_FRAME
+
+        # Check if we are in a post-action cooldown
+        if self._is_in_cooldown and game_clock.real_now() < self._cooldown_end_time:
+            return
+        elif self._is_in_cooldown:
+            self._is_in_cooldown = False # Cooldown finished, ready for next gesture
+
+        prediction = self.read_prediction()
+        self.last_prediction = prediction
+        if prediction is not NO_FRAME:
+            self.track(prediction)
+
+    def track(self, current_prediction):
+        # --- State Machine Logic ---
+        # If the current prediction is idle (5), reset everything.
+        if current_prediction == IDLE_LABEL or current_prediction is None:
+            self._record_aborted_dwell()
+            self._potential_label = None
+            self._potential_label_start_time = None
+            return
+
+        # If the prediction is a new, non-idle gesture
+        if current_prediction != self._potential_label:
+            self._record_aborted_dwell()
+            self._potential_label = current_prediction
+            self._potential_label_start_time = game_clock.real_now()
+        # If the same gesture is being held
+        else:
+            time_held = game_clock.real_now() - self._potential_label_start_time
+            # If dwell time is exceeded, confirm the action and start cooldown
+            if time_held >= self.DWELL_TIME_SECONDS:
+                log.info("Action confirmed", extra={'fields': {'label': int(self._potential_label), 'dwell_s': round(time_held, 2)}})
+                session_analytics.gesture_confirmed(int(self._potential_label), time_held)
+                self._action_to_consume = self._potential_label
+                self._potential_label = None # Reset potential label
+                self._potential_label_start_time = None
+                self._is_in_cooldown = True
+                self._cooldown_end_time = game_clock.real_now() + self.POST_ACTION_COOLDOWN
+
+    def _record_aborted_dwell(self):
+        """Counts the gesture being held as aborted when it is dropped before its dwell time."""
+        if self._potential_label is not None and self._potential_label_start_time is not None:
+            session_analytics.dwell_aborted(int(self._potential_label), game_clock.real_now() - self._potential_label_start_time)
+
+    def consume_action(self):
+        """
+        Called by the game to get a confirmed action. Returns the label then resets.
+        This ensures an action is only processed once.
+        """
+        action = self._action_to_consume
+        if action is not None:
+            self._action_to_consume = None # Consume the action
+        return action
+
+    def get_dwell_progress(self):
+        """
+        Returns the progress of the current dwell timer as a float (0.0 to 1.0).
+        Used by the UI to draw the clock.
+        """
+        if self._potential_label is not None and self._potential_label_start_time is not None:
+            time_held = game_clock.real_now() - self._potential_label_start_time
+            progress = min(time_held / self.DWELL_TIME_SECONDS, 1.0)
+            return progress
+        return 0.0
@@ -0,0 +1,64 @@
+import numpy as np
+from settings import TILESIZE
+
+# This code is used for answering "can the player stand on this tile?" with one array lookup.
+# The grid is rasterized once from the obstacle hitboxes created from the map layers.
+# A cell is blocked when a hitbox of probe_size centered on that cell would collide with
+# any obstacle, which is exactly what the old per-sprite colliderect scan computed.
+
+
+class CollisionGrid:
+    def __init__(self, shape, probe_size, tile_size=TILESIZE):
+        self.blocked = np.zeros(shape, dtype=bool)
+        self.rows, self.cols = shape
+        self.probe_size = tuple(probe_size)
+        self.tile_size = tile_size
+
+        # Offset of the probe's top-left corner inside its cell, same rounding as Rect.center
+        self.probe_offset = (tile_size // 2 - self.probe_size[0] // 2, tile_size // 2 - self.probe_size[1] // 2)
+
+    @classmethod
+    def from_hitboxes(cls, shape, hitboxes, probe_size, tile_size=TILESIZE):
+        grid = cls(shape, probe_size, tile_size)
+        for hitbox in hitboxes:
+            grid.block_rect(hitbox)
+        return grid
+
+    def _cell_range(self, low, high, offset, probe_length):
+        # Cells c where the probe [c*T + offset, c*T + offset + probe_length) overlaps [low, high)
+        first = (low - offset - probe_length) // self.tile_size + 1
+        last = -((offset - high) // self.tile_size) - 1
+        return first, last
+
+    def block_rect(self, hitbox):
+        """Marks every cell whose probe would collide with the given obstacle hitbox."""
+        if hitbox.width <= 0 or hitbox.height <= 0:
+            return
+        col_first, col_last = self._cell_range(hitbox.left, hitbox.right, self.probe_offset[0], self.probe_size[0])
+        row_first, row_last = self._cell_range(hitbox.top, hitbox.bottom, self.probe_offset[1], self.probe_size[1])
+        col_first, row_first = max(col_first, 0), max(row_first, 0)
+        if col_last >= col_first and row_last >= row_first:
+            self.blocked[row_first:row_last + 1, col_first:col_last + 1] = True
+
+    def tile_at(self, pos):
+        """Returns the (col, row) of a position, or None if it is not a tile center."""
+        x, y = pos
+        col, x_rest = divmod(x, self.tile_size)
+        row, y_rest = divmod(y, self.tile_size)
+        if x_rest != self.tile_size // 2 or y_rest != self.tile_size // 2:
+            return None
+        return int(col), int(row)
+
+    def is_blocked(self, col, row):
+        # Everything outside the map counts as blocked
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return True
+        return bool(self.blocked[row, col])
+
+    def can_answer(self, hitbox):
+        """True when the hitbox is a probe sitting on a tile center, so the grid is exact for it."""
+        return hitbox.size == self.probe_size and self.tile_at(hitbox.center) is not None
+
+    def collides(self, hitbox):
+        col, row = self.tile_at(hitbox.center)
+        return self.is_blocked(col, row)
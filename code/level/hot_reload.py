@@ -0,0 +1,46 @@
+import os
+import time
+
+import numpy as np
+from settings import HOT_RELOAD_INTERVAL
+
+# This code is used for the development mode that reloads map CSVs while the game keeps running.
+# The watcher polls the modification time of each layer file. When one changes, the level diffs the
+# old and new layer and patches only the cells that differ, so the camera and model stay loaded.
+
+
+class MapWatcher:
+    def __init__(self, layer_paths, interval=HOT_RELOAD_INTERVAL):
+        self.layer_paths = dict(layer_paths)
+        self.interval = interval
+        self.next_check = 0
+        self.mtimes = {style: self._mtime(path) for style, path in self.layer_paths.items()}
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def changed_layers(self):
+        """Returns the styles whose CSV changed since the last call, polling at most once per interval."""
+        now = time.monotonic()
+        if now < self.next_check:
+            return []
+        self.next_check = now + self.interval
+
+        changed = []
+        for style, path in self.layer_paths.items():
+            mtime = self._mtime(path)
+            if mtime is not None and mtime != self.mtimes[style]:
+                self.mtimes[style] = mtime
+                changed.append(style)
+        return changed
+
+
+def changed_cells(old_layer, new_layer):
+    """Yields (row, col, old_id, new_id) for every cell that differs between two layers."""
+    rows, cols = np.nonzero(old_layer != new_layer)
+    return zip(rows.tolist(), cols.tolist(), old_layer[rows, cols].tolist(), new_layer[rows, cols].tolist())
+
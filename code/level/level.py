@@ -0,0 +1,503 @@
+import pygame
+import time
+from settings import *
+from tile import StaticTile, ObstacleStore, ChunkedObstacleStore, tile_hitbox
+from level.player import Player
+from level.support import *
+from level.map_compiler import occupied_cells, load_layer, EMPTY_CELL
+from level.level_data import load_level_data
+from level.collision import CollisionGrid
+from level.streaming import ChunkStreamer
+from level.pathfinding import HeartGuide, MOVE_NAMES
+from level.hot_reload import MapWatcher, changed_cells
+from level.map_artifacts import static_hitboxes
+from random import choice
+from itertools import chain
+from bisect import bisect_left, bisect_right
+from ui import UI
+from assets import asset_manager
+from button import Button
+from scene import Scene, MenuScene, dimmed_overlay
+from particles import ParticleSystem
+from audio import audio_service
+from analytics import session_analytics
+from profiler import frame_profiler
+from game_clock import game_clock
+from game_log import get_logger
+
+log = get_logger(__name__)
+
+NOT_ESTIMATED = object() # Level.estimated_gestures has not been worked out yet (None means it cannot be completed)
+
+class Item(pygame.sprite.Sprite):
+    def __init__(self, pos, groups, item_type, surface=None):
+        super().__init__(groups)
+        self.sprite_type = 'item'
+        self.item_type = item_type
+        
+        if surface:
+            self.image = surface
+        else:
+            self.image = pygame.Surface((TILESIZE, TILESIZE)) 
+            if self.item_type == 'heart':
+               try:
+                   self.image = asset_manager.scaled('graphics/items/heart.png', (TILESIZE, TILESIZE))
+               except pygame.error as e:
+                   log.error("Error loading heart item image: %s. Using placeholder.", e)
+                   self.image.fill('red') 
+            else:
+                self.image.fill('grey')
+        
+        self.rect = self.image.get_rect(center=pos)
+        self.hitbox = self.rect.inflate(0, 0)
+    
+    def update(self, **kwargs):
+        pass
+
+
+class Level(Scene):
+    """One level engine for every entry in map/levels.json, configured by a LevelSpec."""
+    def __init__(self, spec, camera_instance, screen_surface, font_renderer, level_data=None, hot_reload=False):
+        self.spec = spec
+        # Prefetched data skips the map compile and image decoding, otherwise load it now
+        self.level_data = level_data if level_data is not None else load_level_data(spec)
+        self.display_surface = screen_surface
+        self.font_renderer = font_renderer
+
+        self.visible_sprites = YSortCameraGroup(self.display_surface)
+        self.obstacles = ObstacleStore() # hitboxes of boundaries, grass and objects
+        self.item_sprites = pygame.sprite.Group()
+        self.items_by_tile = {} # (col, row) -> Item, so pickup is a single lookup
+        self.initial_items = {} # (col, row) -> Item for every item on the map, restored by reset()
+        self.particles = ParticleSystem() # reward effects for confirmed gestures and collected hearts
+
+        self.game_camera = camera_instance
+        self.configure_camera()
+        self.player = None 
+        self.player_spawn = None
+        # Dev mode: watch the map CSVs and keep a per-cell index so edits can be patched in place
+        self.map_watcher = MapWatcher(spec.layers) if hot_reload else None
+        self.static_cells = {} if hot_reload else None # (style, col, row) -> (StaticTile or None, hitbox)
+        self.create_map() 
+
+        self.ui = UI()
+        if self.game_camera:
+            self.ui.set_camera(self.game_camera)
+
+        self.hearts_to_collect = spec.objective_count
+        self.level_complete = False
+        self.completion_reported = False
+
+        self.manual_gesture_input_mode = False
+
+    def configure_camera(self):
+        if self.game_camera:
+            self.game_camera.DWELL_TIME_SECONDS = self.spec.dwell_seconds
+            self.game_camera.POST_ACTION_COOLDOWN = self.spec.cooldown_seconds
+
+    def reset(self):
+        """
+        Restarts a pooled level: the player, its inventory and the collected items go back to
+        their initial state. The scenery, obstacles, collision grid and UI are kept as they are.
+        """
+        self.configure_camera()
+        for tile, item_sprite in self.initial_items.items():
+            if not item_sprite.alive():
+                item_sprite.add(self.visible_sprites, self.item_sprites)
+        self.items_by_tile = dict(self.initial_items)
+        self.particles.clear()
+        if self.heart_guide:
+            self.heart_guide.reset()
+
+        self.level_complete = False
+        self.completion_reported = False
+        self.manual_gesture_input_mode = False
+        if self.player:
+            self.player.reset(self.player_spawn)
+            if self.streamer:
+                self.streamer.jump(self.player.tile)
+
+    def create_map(self):
+        # Compiled layers and graphics are shared by every level through the map and asset caches
+        layouts = self.level_data.layouts
+        graphics = {
+            'grass': import_folder("graphics/grass"),
+            'objects': import_folder("graphics/objects"),
+            'heart': asset_manager.scaled("graphics/items/heart.png", (TILESIZE, TILESIZE))
+        }
+        self.graphics = graphics
+        self.streamer = None
+        self.heart_guide = None
+        self._estimated_gestures = NOT_ESTIMATED
+        self.static_obstacles = self.obstacles
+        if self.spec.streaming:
+            # Every obstacle is only rasterized into the collision grid here, scenery tiles and
+            # their hitboxes are built per chunk near the player by load_chunk
+            self.streamer = ChunkStreamer(layouts['boundary'].shape, self.load_chunk, self.unload_chunk)
+            self.obstacles = ChunkedObstacleStore()
+            self.static_obstacles = ObstacleStore()
+
+        artifact = self.level_data.artifact
+        # With a compiled collision grid a streamed map needs no full obstacle pass, chunks build their own hitboxes
+        skip_static = bool(self.streamer and artifact and self.map_watcher is None)
+        for style in (('entities',) if skip_static else ('boundary', 'grass', 'object', 'entities')):
+            # Only the occupied cells are visited, empty cells (-1) are skipped by np.nonzero
+            for row_index, col_index, tile_id in occupied_cells(layouts[style]):
+                self.place_cell(style, col_index, row_index, tile_id)
+
+        # Occupancy grid for tile moves, taken from the compiled map or rasterized once from every obstacle hitbox
+        if self.player:
+            if artifact and artifact.probe_size == self.player.hitbox.size:
+                self.collision_grid = CollisionGrid(artifact.blocked.shape, self.player.hitbox.size)
+                self.collision_grid.blocked = artifact.blocked.copy()
+            else:
+                if skip_static:
+                    self.static_obstacles = static_hitboxes(layouts, [surface.get_size() for surface in graphics['objects']])
+                self.collision_grid = CollisionGrid.from_hitboxes(layouts['boundary'].shape, self.static_obstacles.hitboxes, self.player.hitbox.size)
+            self.player.collision_grid = self.collision_grid
+            self.player.on_tile_change = self.on_player_moved
+
+            # Distance fields from every heart, for on-screen hints and the therapist's gesture estimate
+            self.heart_guide = HeartGuide(self.collision_grid.blocked, self.items_by_tile.keys())
+            # The compiled map carries the estimate, otherwise it is only walked out when asked for
+            if artifact and artifact.spawn == self.player.tile:
+                self._estimated_gestures = artifact.estimated_gestures
+                log.info("%s: estimated %s gestures to complete", self.spec.title, self._estimated_gestures)
+            if self.streamer:
+                self.streamer.update(self.player.tile)
+
+        if self.streamer and self.map_watcher is None:
+            # The full hitbox list was only needed for the grid, hot reload keeps it to patch cells
+            self.static_obstacles = None
+
+    @property
+    def estimated_gestures(self):
+        """Gestures a nearest-first route from the spawn needs to complete the level, None if it cannot be."""
+        if self._estimated_gestures is NOT_ESTIMATED:
+            if not self.heart_guide:
+                return None
+            spawn_tile = (self.player_spawn[0] // TILESIZE, self.player_spawn[1] // TILESIZE)
+            self._estimated_gestures = self.heart_guide.estimate_gestures(spawn_tile, self.spec.objective_count)
+            log.info("%s: estimated %s gestures to complete", self.spec.title, self._estimated_gestures)
+        return self._estimated_gestures
+
+    def place_cell(self, style, col_index, row_index, tile_id):
+        """Creates whatever one occupied map cell holds: an obstacle, a scenery tile, the player or an item."""
+        x = col_index * TILESIZE
+        y = row_index * TILESIZE
+        tile = None
+        if style == 'boundary':
+            hitbox = self.static_obstacles.add_boundary((x,y))
+        elif self.streamer and style in ('grass', 'object'):
+            surface = self.streamed_tile_surface(style, col_index, row_index, tile_id)
+            hitbox = tile_hitbox((x,y), style, surface.get_size())
+            self.static_obstacles.add(hitbox, style)
+        elif style == 'grass':
+            tile = self.add_static_tile((x,y), 'grass', choice(self.graphics['grass']))
+        elif style == 'object':
+            tile = self.add_static_tile((x,y), 'object', self.graphics['objects'][tile_id])
+        else:
+            if tile_id == 394:
+                # A moved spawn point only matters the next time the level starts
+                if self.player is None:
+                    self.player_spawn = (x + TILESIZE // 2, y + TILESIZE // 2)
+                    self.player = Player(pos=(x + TILESIZE // 2, y + TILESIZE // 2), groups=[self.visible_sprites, self.visible_sprites.dynamic_sprites], obstacles=self.obstacles, camera_input=self.game_camera)
+            elif tile_id in (390, 391, 392, 393):
+                item_sprite = Item((x + TILESIZE // 2, y + TILESIZE // 2), [self.visible_sprites, self.item_sprites], 'heart', self.graphics['heart'])
+                self.items_by_tile[(col_index, row_index)] = item_sprite
+                self.initial_items[(col_index, row_index)] = item_sprite
+            return
+
+        if self.static_cells is not None:
+            self.static_cells[(style, col_index, row_index)] = (tile, tile.hitbox if tile else hitbox)
+
+    def remove_cell(self, style, col_index, row_index):
+        """Removes what place_cell created for one cell, used by hot reload."""
+        if style == 'entities':
+            self.items_by_tile.pop((col_index, row_index), None)
+            item_sprite = self.initial_items.pop((col_index, row_index), None)
+            if item_sprite:
+                item_sprite.kill()
+            return
+        entry = self.static_cells.pop((style, col_index, row_index), None)
+        if entry:
+            tile, hitbox = entry
+            if tile:
+                self.visible_sprites.remove_static(tile)
+            self.static_obstacles.remove(hitbox)
+
+    def add_static_tile(self, pos, sprite_type, surface):
+        """Adds a visible scenery tile that also blocks movement."""
+        tile = StaticTile(pos, sprite_type, surface)
+        self.visible_sprites.add_static(tile)
+        self.obstacles.add(tile.hitbox, sprite_type)
+        return tile
+
+    def streamed_tile_surface(self, style, col_index, row_index, tile_id):
+        if style == 'object':
+            return self.graphics['objects'][tile_id]
+        # Grass variants come from the cell position so a reloaded chunk looks the same as before
+        grass = self.graphics['grass']
+        return grass[(col_index * 73856093 ^ row_index * 19349663) % len(grass)]
+
+    def load_chunk(self, chunk):
+        """Builds the scenery tiles and obstacle hitboxes of one chunk, called by the streamer."""
+        first_col, first_row, end_col, end_row = self.streamer.chunk_bounds(chunk)
+        obstacles = self.obstacles.chunk_store(chunk)
+        for style in ('boundary', 'grass', 'object'):
+            layout = self.level_data.layouts[style][first_row:end_row, first_col:end_col]
+            for row_offset, col_offset, tile_id in occupied_cells(layout):
+                col_index, row_index = first_col + col_offset, first_row + row_offset
+                pos = (col_index * TILESIZE, row_index * TILESIZE)
+                if style == 'boundary':
+                    obstacles.add_boundary(pos)
+                    continue
+                tile = StaticTile(pos, style, self.streamed_tile_surface(style, col_index, row_index, tile_id))
+                self.visible_sprites.add_static(tile, chunk)
+                obstacles.add(tile.hitbox, style)
+
+    def unload_chunk(self, chunk):
+        self.visible_sprites.remove_static_chunk(chunk)
+        self.obstacles.remove_chunk(chunk)
+
+    def reload_layer(self, style):
+        """Patches the cells of one layer whose CSV changed on disk, leaving everything else loaded."""
+        start_time = time.perf_counter()
+        path = self.spec.layers[style]
+        old_layout = self.level_data.layouts[style]
+        try:
+            layout = load_layer(path)
+        except (OSError, ValueError) as e:
+            log.error("Could not reload %s: %s", path, e)
+            return
+        if layout.shape != old_layout.shape:
+            log.warning("%s changed size, restart the level to load it", path)
+            return
+        self.level_data.layouts[style] = layout
+
+        cells = list(changed_cells(old_layout, layout))
+        collected = self.initial_items.keys() - self.items_by_tile.keys()
+        touched_chunks = set()
+        for row_index, col_index, old_id, new_id in cells:
+            if old_id != EMPTY_CELL:
+                self.remove_cell(style, col_index, row_index)
+            if new_id != EMPTY_CELL:
+                self.place_cell(style, col_index, row_index, new_id)
+                if (col_index, row_index) in collected:
+                    # An item collected this run stays collected, reset() brings it back
+                    item_sprite = self.items_by_tile.pop((col_index, row_index), None)
+                    if item_sprite:
+                        item_sprite.kill()
+            if self.streamer:
+                touched_chunks.add(self.streamer.chunk_of((col_index, row_index)))
+
+        # Loaded chunks are rebuilt from the new layout, the others pick it up when they stream in
+        if self.streamer:
+            for chunk in touched_chunks & self.streamer.loaded.keys():
+                self.unload_chunk(chunk)
+                self.load_chunk(chunk)
+
+        if self.player and cells:
+            if style != 'entities':
+                grid = CollisionGrid.from_hitboxes(layout.shape, self.static_obstacles.hitboxes, self.player.hitbox.size)
+                self.collision_grid.blocked[:] = grid.blocked
+            # The guide covers every item so reset() can restore them, the collected ones are taken out again
+            self.heart_guide = HeartGuide(self.collision_grid.blocked, self.initial_items.keys())
+            for tile in self.initial_items.keys() - self.items_by_tile.keys():
+                self.heart_guide.collect(tile)
+            self._estimated_gestures = NOT_ESTIMATED
+        log.info("Reloaded %s", path, extra={'fields': {'cells': len(cells), 'ms': round((time.perf_counter() - start_time) * 1000, 1)}})
+
+    def on_player_moved(self, tile):
+        if self.streamer:
+            self.streamer.update(tile)
+        self.player_item_collection_logic(tile)
+
+    def player_item_collection_logic(self, tile):
+        """Called by the player after each move, collects the item on the new tile if there is one."""
+        if self.player and not self.level_complete:
+            item_sprite = self.items_by_tile.pop(tile, None)
+            if item_sprite:
+                item_sprite.kill()
+                self.particles.emit('heart', item_sprite.rect.center)
+                audio_service.play('heart')
+                if self.heart_guide:
+                    self.heart_guide.collect(tile)
+                self.player.collect_item(item_sprite.item_type)
+                session_analytics.heart_collected()
+                if self.player.inventory.get(self.spec.objective_item, 0) >= self.hearts_to_collect:
+                    self.level_complete = True
+                    session_analytics.level_finished(completed=True)
+                    log.info("%s Objective Achieved!", self.spec.title)
+
+    def guidance(self):
+        """Returns (direction name, moves) toward the nearest heart, or None when there is none."""
+        if not self.heart_guide or not self.player:
+            return None
+        step = self.heart_guide.next_step(self.player.tile)
+        if step is None:
+            return None
+        return MOVE_NAMES[step], self.heart_guide.moves_remaining(self.player.tile)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "PAUSE"
+            if event.key == pygame.K_m:
+                self.manual_gesture_input_mode = not self.manual_gesture_input_mode
+                log.info("MANUAL GESTURE MODE: %s", 'ENABLED' if self.manual_gesture_input_mode else 'DISABLED (using camera)')
+                if self.manual_gesture_input_mode and self.spec.announce_manual_input:
+                    log.info("Focus Pygame window and press a number key (0-3) to trigger a one-time move.")
+            
+            if self.manual_gesture_input_mode:
+                if event.key in [pygame.K_0, pygame.K_1, pygame.K_2, pygame.K_3]:
+                    action_label = int(pygame.key.name(event.key))
+                    if self.spec.announce_manual_input:
+                        log.info("Manual action triggered: %s", action_label)
+                    self.confirm_gesture(action_label)
+
+    def complete_scene(self, frozen_surface):
+        """The "level complete" overlay, shown on top of the last frame of the level."""
+        title_font = self.font_renderer.get_font(60) 
+        button_font = self.font_renderer.get_font(50)
+
+        # The darkened background, title and buttons are composed once, not every frame
+        complete_text = asset_manager.text(title_font, f"{self.spec.title} Complete!", 'white')
+        complete_rect = complete_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
+        buttons = []
+        if self.spec.next_level:
+            buttons.append(("LEVEL_COMPLETE_PROCEED", Button(pos=(WIDTH // 2, HEIGHT // 2 + 50), text="Next Level", font=button_font, base_color="white", hover_color="lightgreen")))
+        buttons.append(("RETURN_TO_MENU", Button(pos=(WIDTH // 2, HEIGHT // 2 + 150), text="Main Menu", font=button_font, base_color="white", hover_color="lightblue")))
+        return MenuScene(dimmed_overlay(frozen_surface, 180), buttons, titles=[(complete_text, complete_rect)], camera=self.game_camera)
+
+    def handle_gesture(self, gesture_action):
+        # In manual mode the number keys replace the camera, so its gestures are ignored
+        if self.player and self.player.control_with_gesture and not self.manual_gesture_input_mode:
+            self.confirm_gesture(gesture_action)
+
+    def confirm_gesture(self, action_label):
+        if self.player:
+            # The reward only follows a gesture that actually moved the player
+            if self.player.execute_gesture_move(action_label):
+                self.particles.emit('gesture', self.player.rect.center)
+                audio_service.play('gesture')
+
+    def update(self):
+        if self.map_watcher:
+            for style in self.map_watcher.changed_layers():
+                self.reload_layer(style)
+
+        self.visible_sprites.update() 
+        self.particles.update(game_clock.step)
+        if self.level_complete and not self.completion_reported:
+            self.completion_reported = True
+            return "LEVEL_COMPLETE"
+        return None
+
+    def draw(self, surface):
+        with frame_profiler.section('world'):
+            self.visible_sprites.custom_draw(surface, self.player)
+            self.particles.draw(surface, self.visible_sprites.offset)
+        if self.player:
+            with frame_profiler.section('hud'):
+                self.ui.display(surface, self.player, self.hearts_to_collect, self.guidance())
+        if frame_profiler.enabled:
+            self.ui.display_perf_overlay(surface, self.perf_counters())
+
+    def perf_counters(self):
+        """What the world did last frame, shown by the performance overlay."""
+        group = self.visible_sprites
+        return {'drawn': group.drawn, 'culled': group.culled, 'updated': group.frame_updates, 'particles': len(self.particles)}
+
+
+class YSortCameraGroup(pygame.sprite.Group):
+    """
+    Draws the level sorted by y. Static scenery lives in plain slot records outside the group,
+    the group holds the drawable sprites (player, items) and dynamic_sprites the few that have
+    behaviour, the only ones updated every step. Everything outside the screen is culled.
+    """
+    def __init__(self, display_surface):
+        super().__init__()
+        self.display_surface = display_surface
+        self.offset = pygame.math.Vector2()
+        self.view_rect = self.display_surface.get_rect() # Resized to the target surface by custom_draw
+
+        try:
+            self.floor_surf = asset_manager.image("graphics/tilemap/Background.png", alpha=False)
+        except pygame.error as e:
+            log.error("Error loading background image: %s. Creating fallback.", e)
+            self.floor_surf = pygame.Surface(self.display_surface.get_size())
+            self.floor_surf.fill((30,30,30)) 
+        self.floor_rect = self.floor_surf.get_rect(topleft = (0,0))
+
+        # Scenery tiles are plain slot records kept sorted by y, bucketed by chunk so a streamed
+        # chunk can be dropped at once (None = not streamed)
+        self.static_chunks = {}
+        self.static_tiles = []
+        self.static_keys = []   # centery of every entry in static_tiles, for bisecting the visible rows
+        self.static_reach = 0   # largest distance from a tile's centery to its top or bottom edge
+        self.static_tiles_sorted = True
+
+        self.dynamic_sprites = pygame.sprite.Group()
+
+        # Per-frame counts, for profiling
+        self.pending_updates = 0
+        self.frame_updates = 0
+        self.drawn = 0
+        self.culled = 0
+
+    def add_static(self, tile, chunk=None):
+        self.static_chunks.setdefault(chunk, []).append(tile)
+        self.static_tiles_sorted = False
+
+    def remove_static(self, tile, chunk=None):
+        self.static_chunks[chunk].remove(tile)
+        self.static_tiles_sorted = False
+
+    def remove_static_chunk(self, chunk):
+        if self.static_chunks.pop(chunk, None) is not None:
+            self.static_tiles_sorted = False
+
+    def sort_static_tiles(self):
+        self.static_tiles = sorted(chain.from_iterable(self.static_chunks.values()),key = lambda tile: tile.rect.centery)
+        self.static_keys = [tile.rect.centery for tile in self.static_tiles]
+        self.static_reach = max((tile.rect.height - tile.rect.height // 2 for tile in self.static_tiles), default=0)
+        self.static_tiles_sorted = True
+
+    def custom_draw(self, surface, player):
+        """Draws the part of the level around the player onto surface, centered on the player."""
+        view = self.view_rect
+        view.size = surface.get_size()
+        if player:
+            self.offset.x = player.rect.centerx - view.width // 2
+            self.offset.y = player.rect.centery - view.height // 2
+        
+        floor_offset_pos = self.floor_rect.topleft - self.offset
+        surface.blit(self.floor_surf,floor_offset_pos)
+
+        if not self.static_tiles_sorted:
+            self.sort_static_tiles()
+
+        # Only the rows of scenery that can reach into the screen are looked at, then clipped by x
+        view.topleft = (int(self.offset.x), int(self.offset.y))
+        first = bisect_left(self.static_keys, view.top - self.static_reach)
+        last = bisect_right(self.static_keys, view.bottom + self.static_reach)
+        visible = [tile for tile in self.static_tiles[first:last] if view.colliderect(tile.rect)]
+        visible += [sprite for sprite in self.sprites() if view.colliderect(sprite.rect)]
+
+        # The static part is already sorted, so this sort only has to slot the few sprites in
+        visible.sort(key = lambda sprite: sprite.rect.centery)
+        for sprite in visible:
+            offset_pos = sprite.rect.topleft - self.offset
+            surface.blit(sprite.image,offset_pos)
+
+        self.drawn = len(visible)
+        self.culled = len(self.static_tiles) + len(self) - self.drawn
+        self.frame_updates = self.pending_updates
+        self.pending_updates = 0
+            
+    def update(self, **kwargs):
+        # Scenery and items have no behaviour, only the dynamic sprites are stepped
+        for sprite in self.dynamic_sprites.sprites():
+            sprite.update(**kwargs)
+        self.pending_updates += len(self.dynamic_sprites)
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from assets import asset_manager
+from level.map_compiler import load_layers
+from level.map_artifacts import load_level_artifact
+from game_log import get_logger
+
+log = get_logger(__name__)
+
+# This code is used for preparing everything a level needs before its sprites are created.
+# The heavy part (compiling map layers, decoding image files) can run on a worker thread while
+# the current level is played, so the transition only has to build cheap objects on the main thread.
+
+LEVEL_IMAGE_FOLDERS = ['graphics/grass', 'graphics/objects', 'graphics/player', 'graphics/particles/heal/frames', 'graphics/particles/sparkle']
+LEVEL_IMAGES = ['graphics/items/heart.png', 'graphics/tilemap/Background.png']
+
+
+class LevelData:
+    """Map layers and decoded assets of one level, ready to be turned into sprites."""
+    def __init__(self, spec, layouts, artifact=None):
+        self.spec = spec
+        self.layouts = layouts
+        self.artifact = artifact  # LevelArtifact from code/compile_maps.py, None when built from the CSVs
+
+
+def level_image_paths():
+    paths = list(LEVEL_IMAGES)
+    for folder in LEVEL_IMAGE_FOLDERS:
+        paths.extend(asset_manager.folder_paths(folder))
+    return paths
+
+
+def load_level_data(spec):
+    """Loads the compiled map of a level and decodes its images. Safe to run on a worker thread."""
+    artifact = load_level_artifact(spec, len(asset_manager.folder_paths('graphics/objects')))
+    if artifact is not None:
+        layouts = dict(artifact.layouts)
+    else:
+        log.warning("No up-to-date compiled map for %s, building it from the CSVs (run python code/compile_maps.py)", spec.key)
+        layouts = load_layers(spec.layers)
+    asset_manager.preload(level_image_paths())
+    return LevelData(spec, layouts, artifact)
+
+
+class LevelPrefetcher:
+    """Loads the data of upcoming levels on one background thread."""
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-prefetch')
+        self.pending = {}  # level key -> Future[LevelData]
+
+    def prefetch(self, spec):
+        if spec.key not in self.pending:
+            self.pending[spec.key] = self.executor.submit(load_level_data, spec)
+
+    def take(self, level_key):
+        """
+        Returns the prefetched LevelData for a level, or None if it was never requested.
+        Waits for the worker if it is still running, which is never slower than loading again.
+        """
+        future = self.pending.pop(level_key, None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            log.error("Prefetching %s failed: %s. Loading it on the main thread.", level_key, e)
+            return None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,77 @@
+import json
+from settings import LEVELS_FILE
+
+# This code is used for reading the declarative level definitions in map/levels.json.
+# Every level is described by its map layers, objective, next level and gesture settings,
+# and all of them are run by the same Level engine in level/level.py.
+
+_spec_cache = {}  # levels file path -> LevelSet, the file is parsed once per process
+
+
+class LevelSpec:
+    def __init__(self, data):
+        self.key = data['key']
+        self.title = data.get('title', self.key)
+        self.layers = dict(data['layers'])
+
+        objective = data['objective']
+        self.objective_item = objective.get('item', 'heart')
+        # A missing count means the level never completes (free practice)
+        self.objective_count = objective['count'] if objective.get('count') is not None else float('inf')
+
+        self.next_level = data.get('next_level')
+
+        gesture = data['gesture']
+        self.dwell_seconds = gesture['dwell_seconds']
+        self.cooldown_seconds = gesture['cooldown_seconds']
+
+        self.announce_manual_input = data.get('announce_manual_input', False)
+        # Large maps can stream their scenery in chunks around the player instead of building it all
+        self.streaming = data.get('streaming', False)
+
+    @property
+    def has_objective(self):
+        return self.objective_count != float('inf')
+
+    def __repr__(self):
+        return f"LevelSpec({self.key!r})"
+
+
+class LevelSet:
+    def __init__(self, data):
+        defaults = data.get('defaults', {})
+        self.levels = {}
+        for level_data in data['levels']:
+            merged = dict(defaults)
+            for field, value in level_data.items():
+                # Nested tables (layers, objective, gesture) override the defaults per entry
+                if isinstance(value, dict) and isinstance(defaults.get(field), dict):
+                    merged[field] = {**defaults[field], **value}
+                else:
+                    merged[field] = value
+            spec = LevelSpec(merged)
+            self.levels[spec.key] = spec
+
+        self.start_level = data.get('start_level', next(iter(self.levels)))
+        for spec in self.levels.values():
+            if spec.next_level and spec.next_level not in self.levels:
+                raise ValueError(f"Level '{spec.key}' points to unknown next level '{spec.next_level}'")
+
+    def __getitem__(self, key):
+        return self.levels[key]
+
+    def __contains__(self, key):
+        return key in self.levels
+
+    def __iter__(self):
+        return iter(self.levels.values())
+
+
+def load_level_specs(path=LEVELS_FILE):
+    """Returns the parsed level definitions, reading the file only the first time."""
+    level_set = _spec_cache.get(path)
+    if level_set is None:
+        with open(path) as f:
+            level_set = LevelSet(json.load(f))
+        _spec_cache[path] = level_set
+    return level_set
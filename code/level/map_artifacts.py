@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+from settings import MAP_BUILD_DIR, TILESIZE
+from tile import ObstacleStore, tile_hitbox
+from level.map_compiler import EMPTY_CELL, load_layers, occupied_cells
+from level.collision import CollisionGrid
+from level.pathfinding import HeartGuide
+
+# This code is used for the offline map build done by code/compile_maps.py.
+# Every level is validated (tile IDs, player spawn, reachable hearts) and written to MAP_BUILD_DIR as
+# one .npz holding its layers and collision grid, described by manifest.json. At runtime the level
+# loads that artifact instead of parsing CSVs and rasterizing the grid, as long as the sources match.
+
+MANIFEST_VERSION = 1
+PLAYER_SPAWN = 394
+HEART_IDS = (390, 391, 392, 393)
+
+
+def manifest_path(build_dir=MAP_BUILD_DIR):
+    return os.path.join(build_dir, 'manifest.json')
+
+
+def file_sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def source_record(path):
+    return {'path': path, 'mtime_ns': os.stat(path).st_mtime_ns, 'sha1': file_sha1(path)}
+
+
+def source_unchanged(record):
+    """Same rule as the layer cache: equal modification time, or else equal content hash."""
+    try:
+        if os.stat(record['path']).st_mtime_ns == record['mtime_ns']:
+            return True
+        return file_sha1(record['path']) == record['sha1']
+    except OSError:
+        return False
+
+
+def static_hitboxes(layouts, object_sizes):
+    """Returns an ObstacleStore with the hitbox of every boundary, grass and object cell."""
+    obstacles = ObstacleStore()
+    for style in ('boundary', 'grass', 'object'):
+        for row_index, col_index, tile_id in occupied_cells(layouts[style]):
+            pos = (col_index * TILESIZE, row_index * TILESIZE)
+            if style == 'boundary':
+                obstacles.add_boundary(pos)
+            else:
+                size = object_sizes[tile_id] if style == 'object' else (TILESIZE, TILESIZE)
+                obstacles.add(tile_hitbox(pos, style, size), style)
+    return obstacles
+
+
+def _cells(mask, limit=5):
+    rows, cols = np.nonzero(mask)
+    cells = [f"({col}, {row})" for row, col in zip(rows[:limit].tolist(), cols[:limit].tolist())]
+    return ', '.join(cells) + (' ...' if len(rows) > limit else '')
+
+
+class LevelReport:
+    """Outcome of building one level: the problems found and what the artifact contains."""
+    def __init__(self, spec):
+        self.spec = spec
+        self.errors = []
+        self.warnings = []
+        self.spawn = None
+        self.hearts = []
+        self.reachable_hearts = 0
+        self.estimated_gestures = None
+        self.blocked = None
+
+
+def build_level(spec, object_sizes, probe_size):
+    """Validates the layers of a level and rasterizes its collision grid."""
+    report = LevelReport(spec)
+    try:
+        layouts = load_layers(spec.layers)
+    except (OSError, ValueError) as e:
+        report.errors.append(f"cannot read layers: {e}")
+        return report, None
+
+    shapes = {style: layout.shape for style, layout in layouts.items()}
+    if len(set(shapes.values())) != 1:
+        report.errors.append(f"layers have different sizes: {shapes}")
+        return report, layouts
+
+    objects = layouts['object']
+    unknown = (objects != EMPTY_CELL) & ((objects < 0) | (objects >= len(object_sizes)))
+    if unknown.any():
+        report.errors.append(f"object IDs without an image in graphics/objects (0-{len(object_sizes) - 1}) at {_cells(unknown)}")
+        return report, layouts
+
+    entities = layouts['entities']
+    spawns = list(zip(*np.nonzero(entities == PLAYER_SPAWN)))
+    if not spawns:
+        report.errors.append(f"no player spawn ({PLAYER_SPAWN}) in {spec.layers['entities']}")
+        return report, layouts
+    if len(spawns) > 1:
+        report.warnings.append(f"{len(spawns)} player spawns, only the first one is used")
+    report.spawn = (int(spawns[0][1]), int(spawns[0][0]))
+    stray = (entities != EMPTY_CELL) & (entities != PLAYER_SPAWN) & ~np.isin(entities, HEART_IDS)
+    if stray.any():
+        report.warnings.append(f"unknown entity IDs are ignored at {_cells(stray)}")
+
+    grid = CollisionGrid.from_hitboxes(objects.shape, static_hitboxes(layouts, object_sizes).hitboxes, probe_size)
+    report.blocked = grid.blocked
+    spawn_col, spawn_row = report.spawn
+    if grid.blocked[spawn_row, spawn_col]:
+        report.errors.append(f"player spawn {report.spawn} is inside an obstacle")
+        return report, layouts
+
+    rows, cols = np.nonzero(np.isin(entities, HEART_IDS))
+    report.hearts = list(zip(cols.tolist(), rows.tolist()))
+    guide = HeartGuide(grid.blocked, report.hearts)
+    reachable = set(guide.reachable_hearts(report.spawn))
+    unreachable = [heart for heart in report.hearts if heart not in reachable]
+    report.reachable_hearts = len(report.hearts) - len(unreachable)
+    if unreachable:
+        report.warnings.append(f"hearts that cannot be reached from the spawn: {unreachable}")
+    if spec.has_objective and report.reachable_hearts < spec.objective_count:
+        report.errors.append(f"objective needs {spec.objective_count} hearts but only {report.reachable_hearts} can be reached")
+    report.estimated_gestures = guide.estimate_gestures(report.spawn, spec.objective_count)
+    return report, layouts
+
+
+def write_artifacts(reports, layouts_by_level, object_count, probe_size, build_dir=MAP_BUILD_DIR):
+    """Writes one .npz per level that passed validation and the manifest that describes them."""
+    os.makedirs(build_dir, exist_ok=True)
+    manifest = {'version': MANIFEST_VERSION, 'object_count': object_count, 'probe_size': list(probe_size), 'levels': {}}
+    for report in reports:
+        if report.errors:
+            continue
+        spec = report.spec
+        file_name = f"{spec.key}.npz"
+        tmp_path = os.path.join(build_dir, file_name + '.tmp.npz')
+        arrays = {f"layer_{style}": layout for style, layout in layouts_by_level[spec.key].items()}
+        np.savez_compressed(tmp_path, blocked=report.blocked, **arrays)
+        os.replace(tmp_path, os.path.join(build_dir, file_name))
+        manifest['levels'][spec.key] = {
+            'file': file_name,
+            'sources': {style: source_record(path) for style, path in spec.layers.items()},
+            'spawn': list(report.spawn),
+            'hearts': [list(heart) for heart in report.hearts],
+            'reachable_hearts': report.reachable_hearts,
+            'estimated_gestures': report.estimated_gestures,
+            'warnings': report.warnings,
+        }
+    tmp_path = manifest_path(build_dir) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path(build_dir))
+    return manifest
+
+
+class LevelArtifact:
+    """Precompiled layers and collision grid of one level, with the spawn and gesture estimate of the build."""
+    def __init__(self, layouts, blocked, probe_size, spawn=None, estimated_gestures=None):
+        self.layouts = layouts
+        self.blocked = blocked
+        self.probe_size = probe_size
+        self.spawn = spawn
+        self.estimated_gestures = estimated_gestures
+
+
+def load_level_artifact(spec, object_count, build_dir=MAP_BUILD_DIR):
+    """Returns the LevelArtifact of a level, or None when it is missing or its sources changed since the build."""
+    try:
+        with open(manifest_path(build_dir)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    entry = manifest.get('levels', {}).get(spec.key)
+    if manifest.get('version') != MANIFEST_VERSION or entry is None or manifest.get('object_count') != object_count:
+        return None
+    sources = entry['sources']
+    if set(sources) != set(spec.layers) or any(sources[style]['path'] != path or not source_unchanged(sources[style])
+                                               for style, path in spec.layers.items()):
+        return None
+
+    try:
+        with np.load(os.path.join(build_dir, entry['file'])) as data:
+            layouts = {style: data[f"layer_{style}"] for style in spec.layers}
+            blocked = data['blocked']
+    except (OSError, KeyError, ValueError):
+        return None
+    for layout in layouts.values():
+        layout.setflags(write=False)
+    return LevelArtifact(layouts, blocked, tuple(manifest['probe_size']), tuple(entry['spawn']), entry['estimated_gestures'])
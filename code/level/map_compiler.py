@@ -0,0 +1,114 @@
+import hashlib
+import os
+import tempfile
+import threading
+from csv import reader
+
+import numpy as np
+from settings import MAP_CACHE_DIR
+from game_log import get_logger
+
+log = get_logger(__name__)
+
+# This code is used for turning the Tiled CSV layers in map/ into compact NumPy arrays.
+# Each layer is parsed once into an int16 array and stored in a .npz cache next to the maps.
+# The cache is reused while the source CSV keeps the same modification time, or the same
+# content hash if only the modification time changed (e.g. after a git checkout).
+
+EMPTY_CELL = -1
+
+_memory_cache = {}  # csv path -> (mtime_ns, layer), shared by every level in this process
+_memory_cache_lock = threading.Lock()  # The level prefetcher loads layers on a worker thread
+
+
+def parse_csv_layer(text):
+    """Parses the text of a Tiled CSV export into an int16 array."""
+    rows = [row for row in reader(text.splitlines(), delimiter=',') if row]
+    layer = np.array(rows, dtype=np.int32)
+    if layer.size and (layer.min() < np.iinfo(np.int16).min or layer.max() > np.iinfo(np.int16).max):
+        raise ValueError("Tile IDs do not fit in int16")
+    return layer.astype(np.int16)
+
+
+def cache_path_for(csv_path, cache_dir=MAP_CACHE_DIR):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, name + '.npz')
+
+
+def _read_cache(cache_path):
+    try:
+        with np.load(cache_path) as data:
+            return data['layer'], int(data['mtime_ns']), str(data['sha1'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_cache(cache_path, layer, mtime_ns, sha1):
+    tmp_path = None
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Each writer gets its own temporary file, so only complete files are ever moved into place
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp.npz', delete=False) as f:
+            tmp_path = f.name
+            np.savez(f, layer=layer, mtime_ns=np.int64(mtime_ns), sha1=np.array(sha1))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.warning("Could not write map cache %s: %s", cache_path, e)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def compile_layer(csv_path, cache_dir=MAP_CACHE_DIR):
+    """
+    Returns the layer at csv_path as an int16 array, using the .npz cache when it is still valid.
+    The source is only hashed when its modification time differs from the cached one.
+    """
+    mtime_ns = os.stat(csv_path).st_mtime_ns
+    cache_path = cache_path_for(csv_path, cache_dir)
+    cached = _read_cache(cache_path)
+    if cached and cached[1] == mtime_ns:
+        return cached[0]
+
+    with open(csv_path, 'rb') as f:
+        source = f.read()
+    sha1 = hashlib.sha1(source).hexdigest()
+
+    if cached and cached[2] == sha1:
+        layer = cached[0]
+    else:
+        layer = parse_csv_layer(source.decode('utf-8'))
+    _write_cache(cache_path, layer, mtime_ns, sha1)
+    return layer
+
+
+def load_layer(csv_path, cache_dir=MAP_CACHE_DIR):
+    """Returns the compiled layer, reusing the copy already in memory if the file is unchanged."""
+    mtime_ns = os.stat(csv_path).st_mtime_ns
+    with _memory_cache_lock:
+        cached = _memory_cache.get(csv_path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    layer = compile_layer(csv_path, cache_dir)
+    layer.setflags(write=False)  # Shared between levels, so nobody may modify it in place
+    with _memory_cache_lock:
+        _memory_cache[csv_path] = (mtime_ns, layer)
+    return layer
+
+
+def clear_memory_cache():
+    """Forgets the layers kept in memory, so the next load_layer reads the compiled cache from disk."""
+    with _memory_cache_lock:
+        _memory_cache.clear()
+
+
+def load_layers(paths, cache_dir=MAP_CACHE_DIR):
+    """Loads a {style: csv path} mapping into a {style: layer} mapping."""
+    return {style: load_layer(path, cache_dir) for style, path in paths.items()}
+
+
+def occupied_cells(layer):
+    """Yields (row, col, tile_id) for every non-empty cell, in row-major order."""
+    rows, cols = np.nonzero(layer != EMPTY_CELL)
+    return zip(rows.tolist(), cols.tolist(), layer[rows, cols].tolist())
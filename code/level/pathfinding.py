@@ -0,0 +1,184 @@
+import numpy as np
+
+# This code is used for guiding the player toward hearts and estimating how many gestures a level needs.
+# At level load one multi-source BFS over the collision grid gives every cell its distance to the
+# nearest heart and which heart that is. When a heart is collected only the cells it was nearest to
+# are searched again, starting from the cells around them, so both "next step toward the nearest
+# heart" and "moves remaining" stay constant-time lookups.
+# The grids carry a border of blocked cells, so a neighbour is always flat index +-1 or +-width.
+
+UNREACHABLE = np.iinfo(np.uint16).max  # Paths are at most 65534 moves long
+NO_HEART = -1
+
+# Gesture labels used by Player.execute_gesture_move, keyed by (dx, dy)
+MOVE_LABELS = {(0, -1): 0, (0, 1): 1, (1, 0): 2, (-1, 0): 3}
+MOVE_NAMES = {(0, -1): 'UP', (0, 1): 'DOWN', (1, 0): 'RIGHT', (-1, 0): 'LEFT'}
+
+
+def _wavefront(open_cells, distance, nearest, seeds, offsets, slot):
+    """
+    Breadth-first search from seed cells that already hold their distance and nearest heart (the
+    distances may differ). Every open cell reached gets the distance of the first wave that gets
+    there and that wave's heart, and is closed. All arrays are flat and updated in place, slot is
+    an intp scratch array of the same size used to drop cells reached twice in one wave.
+    """
+    if seeds.size == 0:
+        return
+    seeds = seeds[np.argsort(distance[seeds], kind='stable')]
+    seed_distance = distance[seeds]
+    taken = 0
+    frontier = seeds[:0]
+    level = int(seed_distance[0])
+    while True:
+        # Seeds join the wave once it has grown to their distance
+        if taken < seeds.size:
+            end = int(np.searchsorted(seed_distance, level, side='right'))
+            if end > taken:
+                frontier = np.concatenate((frontier, seeds[taken:end]))
+                taken = end
+        if frontier.size == 0:
+            if taken == seeds.size:
+                return
+            level = int(seed_distance[taken])
+            continue
+
+        neighbours = (frontier[:, None] + offsets).ravel()
+        reached = open_cells[neighbours]
+        neighbours = neighbours[reached]
+        owners = np.repeat(nearest[frontier], len(offsets))[reached]
+        order = np.arange(neighbours.size)
+        slot[neighbours] = order
+        first = slot[neighbours] == order
+        neighbours = neighbours[first]
+        open_cells[neighbours] = False
+        distance[neighbours] = level + 1
+        nearest[neighbours] = owners[first]
+        frontier = neighbours
+        level += 1
+
+
+class HeartGuide:
+    def __init__(self, blocked, heart_tiles):
+        self.heart_tiles = list(heart_tiles)
+        self.index_of = {tile: index for index, tile in enumerate(self.heart_tiles)}
+        self.shape = blocked.shape
+        rows, cols = self.shape
+        self.width = cols + 2
+        self.offsets = np.array((-self.width, self.width, -1, 1), dtype=np.intp)
+
+        self.free = np.zeros((rows + 2, cols + 2), dtype=bool)
+        self.free[1:-1, 1:-1] = ~blocked
+        self.free_flat = self.free.ravel()
+        # Working fields, patched in place by collect(), and their state with every heart remaining
+        self.distance = np.full(self.free.shape, UNREACHABLE, dtype=np.uint16)
+        self.nearest = np.full(self.free.shape, NO_HEART, dtype=np.int32)
+        self._open = np.empty(self.free_flat.size, dtype=bool)  # Scratch: cells the search may still reach
+        self._slot = np.empty(self.free_flat.size, dtype=np.intp)
+        self.heart_cells = np.array([self.cell(tile) for tile in self.heart_tiles], dtype=np.intp)
+
+        distance, nearest = self.distance.ravel(), self.nearest.ravel()
+        seeds = []
+        for index, cell in enumerate(self.heart_cells):
+            # A heart on a blocked cell can never be reached, so it starts no wave at all
+            if self._inside(self.heart_tiles[index]) and self.free_flat[cell] and nearest[cell] == NO_HEART:
+                distance[cell] = 0
+                nearest[cell] = index
+                seeds.append(cell)
+        np.copyto(self._open, self.free_flat)
+        self._open[seeds] = False
+        _wavefront(self._open, distance, nearest, np.array(seeds, dtype=np.intp), self.offsets, self._slot)
+        self.initial_distance = self.distance.copy()
+        self.initial_nearest = self.nearest.copy()
+        self.combined = self.distance[1:-1, 1:-1]  # Moves to the nearest remaining heart, per map cell
+        self.remaining = np.ones(len(self.heart_tiles), dtype=bool)
+
+    def _inside(self, tile):
+        col, row = tile
+        return 0 <= row < self.shape[0] and 0 <= col < self.shape[1]
+
+    def cell(self, tile):
+        """Flat index of a map tile in the bordered grids."""
+        col, row = tile
+        return (row + 1) * self.width + col + 1
+
+    def reset(self):
+        """Marks every heart as remaining again, without searching the grid again."""
+        self.remaining[:] = True
+        np.copyto(self.distance, self.initial_distance)
+        np.copyto(self.nearest, self.initial_nearest)
+
+    def collect(self, tile):
+        """Removes a heart and searches again only the cells for which it was the nearest one."""
+        index = self.index_of.get(tile)
+        if index is None or not self.remaining[index]:
+            return
+        self.remaining[index] = False
+
+        distance, nearest = self.distance.ravel(), self.nearest.ravel()
+        affected = np.flatnonzero(nearest == index)
+        if affected.size == 0:
+            return
+        distance[affected] = UNREACHABLE
+        nearest[affected] = NO_HEART
+        self._open.fill(False)
+        self._open[affected] = True
+
+        # The new distances come in through the cells around the affected area
+        around = (affected[:, None] + self.offsets).ravel()
+        around = np.unique(around[~self._open[around] & (nearest[around] != NO_HEART)])
+        _wavefront(self._open, distance, nearest, around, self.offsets, self._slot)
+
+    def moves_remaining(self, tile):
+        """Minimum number of moves to the nearest remaining heart, or None if none can be reached."""
+        if not self._inside(tile):
+            return None
+        distance = int(self.distance.flat[self.cell(tile)])
+        return None if distance == UNREACHABLE else distance
+
+    def next_step(self, tile):
+        """Returns the (dx, dy) of a move that gets one tile closer to the nearest heart, or None."""
+        distance = self.moves_remaining(tile)
+        if not distance:
+            return None
+        cell = self.cell(tile)
+        for (dx, dy) in MOVE_LABELS:
+            if self.distance.flat[cell + dy * self.width + dx] == distance - 1:
+                return (dx, dy)
+        return None
+
+    def reachable_hearts(self, start_tile):
+        """Returns the hearts that can be walked to from start_tile."""
+        if not self._inside(start_tile) or not self.free_flat[self.cell(start_tile)]:
+            return []
+        distance = np.full(self.free_flat.size, UNREACHABLE, dtype=np.uint16)
+        owner = np.zeros(self.free_flat.size, dtype=np.int32)
+        open_cells = self.free_flat.copy()
+        start = self.cell(start_tile)
+        distance[start] = 0
+        open_cells[start] = False
+        _wavefront(open_cells, distance, owner, np.array([start], dtype=np.intp), self.offsets, self._slot)
+        return [tile for tile, cell in zip(self.heart_tiles, self.heart_cells) if distance[cell] != UNREACHABLE]
+
+    def estimate_gestures(self, start_tile, hearts_needed):
+        """
+        Estimates the gestures a level needs: the length of a nearest-first route from the start
+        that collects hearts_needed reachable hearts, one gesture per tile move.
+        The route is walked on the guide itself, so its remaining hearts are restored afterwards.
+        """
+        collected = [tile for tile, remaining in zip(self.heart_tiles, self.remaining) if not remaining]
+        total, position, taken = 0, start_tile, 0
+        while hearts_needed == float('inf') or taken < hearts_needed:
+            moves = self.moves_remaining(position)
+            if moves is None:
+                break
+            position = self.heart_tiles[int(self.nearest.flat[self.cell(position)])]
+            self.collect(position)
+            total += moves
+            taken += 1
+
+        self.reset()
+        for tile in collected:
+            self.collect(tile)
+        if hearts_needed != float('inf') and taken < hearts_needed:
+            return None
+        return total
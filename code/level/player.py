@@ -2,19 +2,32 @@
 
 import pygame
 from settings import * 
+from game_clock import game_clock
+from animation import load_animation_set
+from game_log import get_logger
+
+log = get_logger(__name__)
+
+PLAYER_FOLDER = 'graphics/player'
+PLAYER_IMAGE = 'graphics/player/down_idle/idle_down.png'
+IDLE_STATUS = {direction: direction + '_idle' for direction in ('up', 'down', 'left', 'right')}
+PLAYER_HITBOX_INFLATE = (0, -10) # The map compiler rasterizes the collision grid with the same hitbox
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, obstacle_sprites, camera_input=None):
+    def __init__(self, pos, groups, obstacles, camera_input=None):
         super().__init__(groups)
         try:
-            self.image = pygame.image.load('graphics/player/down_idle/idle_down.png').convert_alpha()
-        except pygame.error as e:
-            print(f"Error loading player image: {e}. Creating placeholder.")
+            # The frames are loaded once and shared by every player instance
+            self.animations = load_animation_set(PLAYER_FOLDER)
+            self.image = self.animations.frame('down_idle', 0)
+        except (pygame.error, OSError, KeyError) as e:
+            log.error("Error loading player image: %s. Creating placeholder.", e)
+            self.animations = None
             self.image = pygame.Surface((TILESIZE, TILESIZE))
             self.image.fill((0, 0, 255)) # Blue placeholder
             
         self.rect = self.image.get_rect(center=pos) 
-        self.hitbox = self.rect.inflate(0, -10) 
+        self.hitbox = self.rect.inflate(*PLAYER_HITBOX_INFLATE)
         self.hitbox.center = self.rect.center
 
         # Tile-based Movement
@@ -22,7 +35,9 @@ class Player(pygame.sprite.Sprite):
         self.move_cooldown_duration = 200  # Cooldown for keyboard movement
         self.last_move_time = 0
 
-        self.obstacle_sprites = obstacle_sprites
+        self.obstacles = obstacles
+        self.collision_grid = None  # Set by the level once the map is built
+        self.on_tile_change = None  # Called with the new (col, row) after every successful move
         self.inventory = {'heart': 0}
 
         # Gesture Control Toggle
@@ -31,11 +46,12 @@ class Player(pygame.sprite.Sprite):
 
         # Status
         self.status = 'down_idle'
+        self.last_step_time = None  # game_clock ticks of the last successful move, for the walk cycle
 
     def input(self):
         """Handles keyboard input and toggling gesture control."""
         keys = pygame.key.get_pressed()
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.ticks()
 
         # --- Keyboard Movement (respects cooldown) ---
         can_move_now = (current_time - self.last_move_time > self.move_cooldown_duration)
@@ -66,17 +82,17 @@ class Player(pygame.sprite.Sprite):
         # --- Toggle Gesture Control ---
         if keys[pygame.K_g] and not self.g_key_was_pressed:
             self.control_with_gesture = not self.control_with_gesture
-            print(f"Gesture control: {'Enabled' if self.control_with_gesture else 'Disabled'}")
+            log.info("Gesture control: %s", 'Enabled' if self.control_with_gesture else 'Disabled')
         self.g_key_was_pressed = keys[pygame.K_g]
 
 
     def execute_gesture_move(self, action_label):
         """
-        Executes a move based on a confirmed gesture action.
+        Executes a move based on a confirmed gesture action and returns whether the player moved.
         This bypasses the standard move cooldown, as the dwell time is the cooldown.
         """
         if not self.control_with_gesture:
-            return
+            return False
 
         move_dx_tile, move_dy_tile = 0, 0
         if action_label == 0: # Up
@@ -89,10 +105,11 @@ class Player(pygame.sprite.Sprite):
             move_dx_tile = -1; self.status = 'left'
 
         if move_dx_tile != 0 or move_dy_tile != 0:
-            self.move_tile(move_dx_tile, move_dy_tile)
+            return self.move_tile(move_dx_tile, move_dy_tile)
+        return False
 
     def move_tile(self, dx_tile, dy_tile):
-        """Moves the player by a number of tiles, checking for collisions first."""
+        """Moves the player by a number of tiles, checking for collisions first. Returns whether it moved."""
         target_center_x = self.rect.centerx + dx_tile * self.tile_size
         target_center_y = self.rect.centery + dy_tile * self.tile_size
 
@@ -102,27 +119,55 @@ class Player(pygame.sprite.Sprite):
         if not self.check_obstacle_collision(future_hitbox):
             self.rect.center = (target_center_x, target_center_y)
             self.hitbox.center = self.rect.center
-        else:
-            # Optionally, revert status to idle if move failed
-            pass
+            self.last_step_time = game_clock.ticks()
+            if self.on_tile_change:
+                self.on_tile_change(self.tile)
+            return True
+        # Optionally, revert status to idle if move failed
+        return False
+
+    @property
+    def tile(self):
+        """The (col, row) of the tile the player is standing on."""
+        return (self.rect.centerx // self.tile_size, self.rect.centery // self.tile_size)
 
     def check_obstacle_collision(self, future_hitbox):
-        for sprite in self.obstacle_sprites:
-            if hasattr(sprite, 'hitbox') and sprite.hitbox.colliderect(future_hitbox):
-                return True 
-        return False 
+        # Tile-aligned moves are answered by a single lookup in the occupancy grid
+        if self.collision_grid is not None and self.collision_grid.can_answer(future_hitbox):
+            return self.collision_grid.collides(future_hitbox)
+
+        # Hitbox-precise fallback for positions that are not on the tile grid
+        return self.obstacles.collides(future_hitbox)
+
+    def reset(self, pos):
+        """Puts the player back on its spawn point with an empty inventory, for restarting a level."""
+        self.rect.center = pos
+        self.hitbox.center = self.rect.center
+        self.last_move_time = 0
+        self.inventory = {'heart': 0}
+        self.control_with_gesture = True
+        self.status = 'down_idle'
+        self.last_step_time = None
+        self.g_key_was_pressed = False
 
     def collect_item(self, item_name):
         self.inventory.setdefault(item_name, 0)
         self.inventory[item_name] += 1
-        print(f"Player collected {item_name}. Inventory: {self.inventory}")
+        log.info("Player collected %s", item_name, extra={'fields': {'inventory': self.inventory[item_name]}})
 
     def animate(self):
-        # Placeholder for animation logic
-        pass
+        # Faces the last move direction, with the walk cycle for a moment after a step if enabled
+        if not self.animations:
+            return
+        now = game_clock.ticks()
+        direction = self.status.partition('_')[0]
+        walking = PLAYER_WALK_ANIMATION and self.last_step_time is not None and now - self.last_step_time < WALK_ANIMATION_MS
+        status = direction if walking else IDLE_STATUS.get(direction, self.status)
+        if status in self.animations:
+            self.image = self.animations.frame(status, now)
 
     def update(self, **kwargs):
-        # The gesture_action is passed from TrialLevel to player.execute_gesture_move
+        # The gesture_action is passed from Level to player.execute_gesture_move
         # The keyboard input is handled by self.input()
         self.input()
         self.animate()
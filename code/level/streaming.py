@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from settings import CHUNK_SIZE, CHUNK_LOAD_RADIUS, CHUNK_LOOKAHEAD, CHUNK_BUDGET
+
+# This code is used for streaming large maps chunk by chunk instead of building every tile at level start.
+# The map is split into CHUNK_SIZE x CHUNK_SIZE tile chunks. Chunks around the player (and further
+# ahead in the direction of travel) are instantiated, and the least recently needed chunks are
+# dropped once more than CHUNK_BUDGET chunks are loaded, so memory stays flat however large the map is.
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+class ChunkStreamer:
+    def __init__(self, map_shape, load_chunk, unload_chunk, chunk_size=CHUNK_SIZE,
+                 radius=CHUNK_LOAD_RADIUS, lookahead=CHUNK_LOOKAHEAD, budget=CHUNK_BUDGET):
+        rows, cols = map_shape
+        self.chunk_size = chunk_size
+        self.chunk_cols = -(-cols // chunk_size)
+        self.chunk_rows = -(-rows // chunk_size)
+        self.radius = radius
+        self.lookahead = lookahead
+        # The budget can never be smaller than the chunks needed around the player
+        self.budget = max(budget, (2 * radius + 1) ** 2)
+
+        self.load_chunk = load_chunk      # Called with (chunk_col, chunk_row) to instantiate a chunk
+        self.unload_chunk = unload_chunk  # Called with (chunk_col, chunk_row) to drop its tiles
+        self.loaded = OrderedDict()       # chunk -> True, least recently needed first
+
+        self.last_tile = None
+        self.direction = (0, 0)
+        self.loads = 0
+        self.evictions = 0
+
+    def chunk_of(self, tile):
+        return (tile[0] // self.chunk_size, tile[1] // self.chunk_size)
+
+    def chunk_bounds(self, chunk):
+        """Returns (first_col, first_row, end_col, end_row) of a chunk in tiles, end exclusive."""
+        first_col, first_row = chunk[0] * self.chunk_size, chunk[1] * self.chunk_size
+        return first_col, first_row, first_col + self.chunk_size, first_row + self.chunk_size
+
+    def _chunks_around(self, center, radius):
+        for chunk_row in range(center[1] - radius, center[1] + radius + 1):
+            for chunk_col in range(center[0] - radius, center[0] + radius + 1):
+                if 0 <= chunk_col < self.chunk_cols and 0 <= chunk_row < self.chunk_rows:
+                    yield (chunk_col, chunk_row)
+
+    def wanted_chunks(self, tile):
+        """Chunks around the player first, then the ones ahead in the direction of travel."""
+        center = self.chunk_of(tile)
+        wanted = list(self._chunks_around(center, self.radius))
+        if self.direction != (0, 0):
+            ahead = (center[0] + self.direction[0] * self.lookahead, center[1] + self.direction[1] * self.lookahead)
+            for chunk in self._chunks_around(ahead, 0):
+                if chunk not in wanted:
+                    wanted.append(chunk)
+        return wanted
+
+    def update(self, tile):
+        """Loads the chunks needed at tile and evicts old ones over the budget. Call after every move."""
+        if self.last_tile is not None and tile != self.last_tile:
+            self.direction = (_sign(tile[0] - self.last_tile[0]), _sign(tile[1] - self.last_tile[1]))
+        self.last_tile = tile
+
+        wanted = self.wanted_chunks(tile)
+        for chunk in wanted:
+            if chunk in self.loaded:
+                self.loaded.move_to_end(chunk)
+            else:
+                self.load_chunk(chunk)
+                self.loaded[chunk] = True
+                self.loads += 1
+
+        while len(self.loaded) > self.budget:
+            oldest = next(iter(self.loaded))
+            if oldest in wanted:
+                break
+            del self.loaded[oldest]
+            self.unload_chunk(oldest)
+            self.evictions += 1
+
+    def jump(self, tile):
+        """Loads the chunks around a teleport target, a jump is not a direction of travel."""
+        self.last_tile = None
+        self.direction = (0, 0)
+        self.update(tile)
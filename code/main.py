@@ -1,148 +1,200 @@
 import pygame, sys
+import time
+from collections import OrderedDict
 from settings import *
 from main_menu import MainMenu
-from level.level1 import Level as Level1 # Ubah nama impor untuk kejelasan
-from level.level2 import Level as Level2 # Anda perlu membuat file ini dan memastikan impor ini benar
-from level.trial import TrialLevel # TrialLevel untuk level percobaan, jika ada
-from camera import HandGestureCamera
+from scene import SceneStack
+from game_clock import game_clock
+from profiler import frame_profiler
+from audio import audio_service
+from analytics import session_analytics
+from level.level import Level
+from level.level_spec import load_level_specs
+from level.level_data import LevelPrefetcher
+from game_log import get_logger, setup_logging, stop_logging
+
 # from ui import UI # UI dikelola di dalam Level
 
+log = get_logger(__name__)
+
 class Game:
-    def __init__(self):
+    def __init__(self, dev_mode=False, patient_id=PATIENT_ID, camera=None, analytics=True):
+        pygame.mixer.pre_init(44100, -16, 2, 512) # Buffer kecil supaya efek suara langsung terdengar
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption('Heart Collector') # Ganti judul game jika mau
-        self.clock = pygame.time.Clock()
+        self.clock = pygame.time.Clock() # Hanya membatasi kecepatan gambar (FPS), waktu game ada di game_clock
+
+        # Efek suara di-decode di thread terpisah, musik di-stream dari disk
+        audio_service.start()
+        audio_service.play_music()
+
+        # Metrik terapi per sesi, ditulis ke SQLite di thread terpisah
+        if analytics:
+            session_analytics.start(patient_id)
         
-        self.current_game_state = "MENU" # Menggunakan nama state yang lebih deskriptif
         self.active_level_instance = None # Untuk menyimpan instance level yang sedang berjalan
 
-        self.camera = HandGestureCamera()
-        self.main_menu = MainMenu(self.screen) # MainMenu juga akan berfungsi sebagai font_renderer
+        if camera is None:
+            # Diimpor di sini supaya replay dan soak test tidak butuh OpenCV, MediaPipe dan TensorFlow
+            from camera import HandGestureCamera
+            camera = HandGestureCamera()
+        self.camera = camera
+        self.input_source = None # InputRecorder atau InputReplayer (replay.py), None = input langsung dari pygame
 
-        # Placeholder untuk Level 2 - Anda perlu membuat kelas Level2
-        self.level_definitions = {
-            "TRIAL": TrialLevel, # Level percobaan, jika ada
-            "LEVEL_1": Level1,
-            "LEVEL_2": Level2, # Tambahkan ini setelah Level2 dibuat dan diimpor
-        }
+        # Semua level didefinisikan di map/levels.json dan dijalankan oleh satu kelas Level
+        self.level_definitions = load_level_specs()
+        self.main_menu = MainMenu(self.screen, self.level_definitions, self.camera) # MainMenu juga akan berfungsi sebagai font_renderer
         self.current_level_key = None
+        self.level_prefetcher = LevelPrefetcher() # Memuat data level berikutnya di thread terpisah
+        self.level_pool = OrderedDict() # level key -> Level, dipakai ulang saat level dimulai lagi
+        self.dev_mode = dev_mode # --dev: file map CSV dimuat ulang otomatis saat diedit
+
+        # Menu, overlay dan level adalah scene di satu stack, hanya yang paling atas yang aktif
+        self.scenes = SceneStack()
+        self.scenes.push(self.main_menu.main_scene())
 
 
     def start_level(self, level_key):
         if level_key in self.level_definitions:
             self.current_level_key = level_key
-            # Oper screen dan main_menu (sebagai font_renderer) ke Level
-            self.active_level_instance = self.level_definitions[level_key](
-                camera_instance=self.camera,
-                screen_surface=self.screen,
-                font_renderer=self.main_menu # MainMenu memiliki metode get_font
-            )
-            self.current_game_state = "PLAYING_LEVEL"
-            print(f"Starting {level_key}") # Pesan ini akan muncul jika level_key ada di definisi
+            spec = self.level_definitions[level_key]
+            start_time = time.perf_counter()
+            pooled_level = self.level_pool.pop(level_key, None)
+            if pooled_level:
+                # Level yang pernah dimainkan cukup di-reset, dunia statisnya tidak dibangun ulang
+                pooled_level.reset()
+                self.active_level_instance = pooled_level
+                how = 'reset from pool'
+            else:
+                level_data = self.level_prefetcher.take(level_key)
+                # Oper screen dan main_menu (sebagai font_renderer) ke Level
+                self.active_level_instance = Level(
+                    spec,
+                    camera_instance=self.camera,
+                    screen_surface=self.screen,
+                    font_renderer=self.main_menu, # MainMenu memiliki metode get_font
+                    level_data=level_data,
+                    hot_reload=self.dev_mode
+                )
+                how = 'built, prefetched' if level_data else 'built, loaded on demand'
+            self.level_pool[level_key] = self.active_level_instance
+            while len(self.level_pool) > LEVEL_POOL_SIZE:
+                self.level_pool.popitem(last=False) # Buang level yang paling lama tidak dimainkan
+            self.last_transition_ms = (time.perf_counter() - start_time) * 1000
+            self.scenes.replace(self.active_level_instance)
+            session_analytics.level_started(level_key)
+            log.info("Starting %s (%s)", level_key, how, extra={'fields': {'ms': round(self.last_transition_ms, 1)}})
+
+            # Siapkan level berikutnya selama level ini dimainkan, kecuali sudah ada di pool
+            if spec.next_level and spec.next_level not in self.level_pool:
+                self.level_prefetcher.prefetch(self.level_definitions[spec.next_level])
         else:
-            print(f"Error: Level key '{level_key}' not found in definitions.")
-            self.current_game_state = "MENU" # Kembali ke menu jika level tidak ditemukan
+            log.error("Level key '%s' not found in definitions.", level_key)
+            self.return_to_menu() # Kembali ke menu jika level tidak ditemukan
+
+    def handle_action(self, action):
+        """Follows what a scene returned: opens, closes or replaces scenes on the stack."""
+        if action is None:
+            return
+        if action == "PLAY":
+            self.start_level(self.level_definitions.start_level)
+        elif action == "LEVELS":
+            self.scenes.push(self.main_menu.levels_scene())
+        elif action in ("BACK", "RESUME"):
+            self.scenes.pop()
+        elif action == "PAUSE":
+            # Layar terakhir dibekukan sekali dan dipakai sebagai latar menu pause
+            self.scenes.push(self.main_menu.pause_scene(self.screen.copy()))
+        elif action == "LEVEL_COMPLETE":
+            # Gambar langkah terakhir dulu supaya overlay menampilkan level yang sudah selesai
+            self.active_level_instance.draw(self.screen)
+            self.scenes.push(self.active_level_instance.complete_scene(self.screen.copy()))
+        elif action == "LEVEL_COMPLETE_PROCEED":
+            log.info("%s complete. Proceeding...", self.current_level_key)
+            next_level = self.level_definitions[self.current_level_key].next_level
+            if next_level:
+                self.start_level(next_level)
+            else: # Jika tidak ada level berikutnya yang didefinisikan setelah level saat ini
+                log.info("No next level defined after %s. Returning to menu.", self.current_level_key)
+                self.return_to_menu()
+        elif action in ("MENU", "RETURN_TO_MENU"):
+            self.return_to_menu()
+        elif action == "QUIT":
+            self.quit()
+        elif action in self.level_definitions:
+            self.start_level(action)
+
+    def return_to_menu(self):
+        session_analytics.level_finished(completed=False) # Tidak berbuat apa-apa jika level sudah selesai
+        self.active_level_instance = None
+        self.scenes.replace(self.main_menu.main_scene())
+
+    def quit(self):
+        if self.camera: self.camera.release()
+        session_analytics.stop()
+        pygame.quit()
+        sys.exit()
+
+    def frame(self, draw=True):
+        frame_profiler.begin_frame()
+        with frame_profiler.section('events'):
+            events = self.input_source.begin_frame() if self.input_source else pygame.event.get()
+            # Semua event diteruskan ke scene paling atas (menu, overlay, atau level)
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.quit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    frame_profiler.toggle() # Overlay performa, digambar oleh UI di dalam level
+                    continue
+                self.handle_action(self.scenes.top.handle_event(event))
+
+        # Kamera tetap diproses di setiap scene, jadi menu juga bisa dipilih dengan gestur
+        if self.camera:
+            with frame_profiler.section('gesture'):
+                self.camera.process()
+            gesture_action = self.camera.consume_action()
+            if gesture_action is not None:
+                self.handle_action(self.scenes.top.handle_gesture(gesture_action))
+        if self.input_source:
+            self.input_source.end_frame(self.camera)
+
+        # Gameplay maju dengan langkah tetap, berapapun kecepatan gambar layar
+        with frame_profiler.section('update'):
+            for _ in game_clock.advance():
+                self.handle_action(self.scenes.top.update())
+
+        if draw:
+            with frame_profiler.section('draw'):
+                self.screen.fill("black") 
+                self.scenes.top.draw(self.screen)
 
     def run(self):
         while True:
-            # Event handling umum
-            for event in pygame.event.get(): # Get all events
-                if event.type == pygame.QUIT:
-                    if self.camera: self.camera.release()
-                    pygame.quit()
-                    sys.exit()
-                
-                # Pass event to active level if it exists and has a handler
-                if self.active_level_instance and hasattr(self.active_level_instance, 'handle_event'):
-                    self.active_level_instance.handle_event(event) # Call the level's event handler
-
-                
-                if self.current_game_state == "PLAYING_LEVEL" and event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        if self.active_level_instance:
-                            # Simpan layar saat ini sebelum masuk ke menu pause
-                            self.last_game_surface_before_pause = self.screen.copy()
-                            self.current_game_state = "PAUSE_MENU"
-
-
-            # State machine utama
-            if self.current_game_state == "MENU":
-                menu_action = self.main_menu.show_main_menu()
-                if menu_action == "PLAY": 
-                    self.start_level("LEVEL_1")
-                elif menu_action == "LEVELS":
-                    self.current_game_state = "LEVEL_SELECT_MENU"
-                elif menu_action == "QUIT":
-                    if self.camera: self.camera.release()
-                    pygame.quit()
-                    sys.exit()
-
-            elif self.current_game_state == "LEVEL_SELECT_MENU":
-                level_choice = self.main_menu.show_levels_menu()
-                if level_choice == "BACK":
-                    self.current_game_state = "MENU"
-                elif level_choice == "TRIAL": # Tambahkan opsi untuk memulai Level Percobaan
-                    self.start_level("TRIAL")
-                elif level_choice == "LEVEL_1":
-                    self.start_level("LEVEL_1")
-                elif level_choice == "LEVEL_2": # Tambahkan opsi untuk memulai Level 2 dari menu level
-                    self.start_level("LEVEL_2")
-
-
-            elif self.current_game_state == "PLAYING_LEVEL":
-                self.screen.fill("black") 
-                if self.active_level_instance:
-                    level_status = self.active_level_instance.run()
-
-                    if level_status == "LEVEL_COMPLETE_PROCEED":
-                        print(f"{self.current_level_key} complete. Proceeding...")
-                        if self.current_level_key == "LEVEL_1":
-                            self.start_level("LEVEL_2") # Aktifkan pemanggilan untuk memulai Level 2
-                        # Tambahkan logika untuk level lain jika ada, misal setelah Level 2
-                        # elif self.current_level_key == "LEVEL_2":
-                        #     print("Level 2 complete! Congratulations!")
-                        #     self.active_level_instance = None 
-                        #     self.current_game_state = "MENU" 
-                        else: # Jika tidak ada level berikutnya yang didefinisikan setelah level saat ini
-                            print(f"No next level defined after {self.current_level_key}. Returning to menu.")
-                            self.active_level_instance = None
-                            self.current_game_state = "MENU"
-                    
-                    elif level_status == "RETURN_TO_MENU":
-                        self.active_level_instance = None
-                        self.current_game_state = "MENU"
-                    
-                    elif level_status == "PAUSED": 
-                        # Simpan layar saat ini jika status PAUSED dikembalikan oleh level
-                        # (Meskipun lebih umum K_ESCAPE ditangani di loop utama Game)
-                        if not hasattr(self, 'last_game_surface_before_pause'):
-                             self.last_game_surface_before_pause = self.screen.copy()
-                        self.current_game_state = "PAUSE_MENU"
-
-                else:
-                    print("Error: No active level instance while in PLAYING_LEVEL state.")
-                    self.current_game_state = "MENU"
-            
-            elif self.current_game_state == "PAUSE_MENU":
-                pause_action = self.main_menu.show_pause_menu(getattr(self, 'last_game_surface_before_pause', None))
-                if pause_action == "RESUME":
-                    self.current_game_state = "PLAYING_LEVEL"
-                elif pause_action == "MENU":
-                    self.active_level_instance = None 
-                    self.current_game_state = "MENU"
-                
-                if hasattr(self, 'last_game_surface_before_pause'):
-                    del self.last_game_surface_before_pause
-
-
-            pygame.display.update()
+            self.frame()
+            with frame_profiler.section('flip'):
+                pygame.display.update()
             self.clock.tick(FPS)
 
 if __name__ == '__main__':
-    game = Game()
+    setup_logging() # Semua pesan ditulis oleh thread terpisah lewat antrian
+    # --patient <id>: metrik sesi disimpan atas nama pasien ini
+    patient_id = sys.argv[sys.argv.index('--patient') + 1] if '--patient' in sys.argv[:-1] else PATIENT_ID
+    game = Game(dev_mode='--dev' in sys.argv, patient_id=patient_id)
+    # --record <file>: semua input disimpan supaya sesi bisa diputar ulang dengan replay.py
+    recorder = None
+    if '--record' in sys.argv[:-1]:
+        from replay import InputRecorder
+        recorder = InputRecorder(sys.argv[sys.argv.index('--record') + 1])
+        game.input_source = recorder
+        recorder.start()
     try:
         game.run()
     finally:
         if hasattr(game, 'camera') and game.camera:
             game.camera.release()
+        game.level_prefetcher.shutdown()
+        if recorder:
+            recorder.close(game)
+        session_analytics.stop()
+        stop_logging()
@@ -1,21 +1,69 @@
-import pygame, sys
-import os
+import pygame
 from button import Button
+from scene import MenuScene, dimmed_overlay
 from settings import *
+from assets import asset_manager
+
+# Level select layout: the buttons sit between the first row and BACK, closer together as more levels
+# are added, and continue in further columns once they would get closer than LEVEL_MIN_SPACING
+LEVEL_LIST_TOP = 200
+LEVEL_LIST_BOTTOM = 500 # lowest button center that still leaves room above BACK
+LEVEL_BACK_Y = 600
+LEVEL_SPACING = 100
+LEVEL_MIN_SPACING = 75
+
+
+def level_button_layout(count):
+    """Returns the center of each of count level buttons and the font size that fits their spacing."""
+    span = LEVEL_LIST_BOTTOM - LEVEL_LIST_TOP
+    rows = min(count, span // LEVEL_MIN_SPACING + 1) or 1
+    columns = -(-count // rows)
+    rows = -(-count // columns) if count else 1
+    spacing = min(LEVEL_SPACING, span / (rows - 1)) if rows > 1 else LEVEL_SPACING
+    font_size = min(50, int(spacing * 0.6))
+    positions = [(int(WIDTH * (index // rows + 0.5) / columns), int(LEVEL_LIST_TOP + (index % rows) * spacing))
+                 for index in range(count)]
+    return positions, font_size
+
 
 class MainMenu:
-    def __init__(self, screen):
+    def __init__(self, screen, level_definitions=(), camera=None):
         self.screen = screen
-        self.font = pygame.font.Font("graphics/font/joystix.ttf", 45) if os.path.exists("graphics/font/joystix.ttf") else pygame.font.Font(None, 45)
+        self.camera = camera # Menus show the dwell progress of hand gestures
+        self.font = self.get_font(45)
         
         # Load background image (fallback to gradient if not found)
         try:
-            self.background = pygame.image.load("graphics/tilemap/Background.png")
-            self.background = pygame.transform.scale(self.background, (WIDTH, HEIGHT))
+            self.background = asset_manager.scaled("graphics/tilemap/Background.png", (WIDTH, HEIGHT), alpha=False)
         except:
             # Create gradient background as fallback
             self.background = self.create_gradient_background()
 
+        # Titles, buttons and overlays are built once and reused every frame
+        self.main_title = asset_manager.text(self.get_font(80), "MAIN MENU", TEXT_COLOR_SELECTED)
+        self.main_title_shadow = asset_manager.text(self.get_font(80), "MAIN MENU", (50, 50, 50))
+        self.main_title_rect = self.main_title.get_rect(center=(WIDTH//2, 100))
+        self.play_button = Button((WIDTH//2, 250), "PLAY", self.get_font(50), "white", "green")
+        self.levels_button = Button((WIDTH//2, 375), "LEVELS", self.get_font(50), "white", "blue")
+        self.quit_button = Button((WIDTH//2, 500), "QUIT", self.get_font(50), "white", "red")
+
+        self.pause_title = asset_manager.text(self.get_font(60), "PAUSED", "white")
+        self.pause_rect = self.pause_title.get_rect(center=(WIDTH//2, 150))
+        self.resume_button = Button((WIDTH//2, 250), "RESUME", self.get_font(50), "white", "green")
+        self.menu_button = Button((WIDTH//2, 400), "MENU", self.get_font(50), "white", "yellow")
+
+        self.levels_title = asset_manager.text(self.get_font(80), "LEVELS", TEXT_COLOR_SELECTED)
+        self.levels_title_rect = self.levels_title.get_rect(center=(WIDTH//2, 100))
+        # One button per level in map/levels.json, practice levels without an objective in green
+        self.level_buttons = []
+        specs = list(level_definitions)
+        positions, font_size = level_button_layout(len(specs))
+        for spec, pos in zip(specs, positions):
+            color = "blue" if spec.has_objective else "green"
+            button = Button(pos, spec.title.upper(), self.get_font(font_size), "white", color)
+            self.level_buttons.append((spec.key, button))
+        self.back_button = Button((WIDTH//2, LEVEL_BACK_Y), "BACK", self.get_font(50), "white", "red")
+
     def create_gradient_background(self):
         """Create a gradient background if image not found"""
         surface = pygame.Surface((WIDTH, HEIGHT))
@@ -26,125 +74,20 @@ class MainMenu:
         return surface
 
     def get_font(self, size):
-        if os.path.exists("graphics/font/joystix.ttf"):
-            return pygame.font.Font("graphics/font/joystix.ttf", size)
-        return pygame.font.Font(None, size)
-
-    def show_main_menu(self):
-        while True:
-            # Draw background
-            self.screen.blit(self.background, (0, 0))
-            
-            mouse_pos = pygame.mouse.get_pos()
-
-            title = self.get_font(80).render("MAIN MENU", True, TEXT_COLOR_SELECTED)
-            title_rect = title.get_rect(center=(WIDTH//2, 100))
-            
-            # Add shadow effect to title
-            shadow = self.get_font(80).render("MAIN MENU", True, (50, 50, 50))
-            self.screen.blit(shadow, (title_rect.x + 3, title_rect.y + 3))
-            self.screen.blit(title, title_rect)
-
-            play_button = Button((WIDTH//2, 250), "PLAY", self.get_font(50), "white", "green")
-            levels_button = Button((WIDTH//2, 375), "LEVELS", self.get_font(50), "white", "blue")
-            quit_button = Button((WIDTH//2, 500), "QUIT", self.get_font(50), "white", "red")
-
-            for button in [play_button, levels_button, quit_button]:
-                button.change_color(mouse_pos)
-                button.draw(self.screen)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if play_button.check_click(mouse_pos):
-                        return "PLAY"
-                    if levels_button.check_click(mouse_pos):
-                        return "LEVELS"
-                    if quit_button.check_click(mouse_pos):
-                        return "QUIT"
-
-            pygame.display.update()
-
-    def show_pause_menu(self, frozen_surface=None):
-        while True:
-            # Draw the frozen game screen if provided
-            if frozen_surface:
-                self.screen.blit(frozen_surface, (0, 0))
-                # Add semi-transparent overlay
-                overlay = pygame.Surface((WIDTH, HEIGHT))
-                overlay.set_alpha(128)
-                overlay.fill((0, 0, 0))
-                self.screen.blit(overlay, (0, 0))
-            else:
-                self.screen.fill("gray")
-            
-            mouse_pos = pygame.mouse.get_pos()
-
-            # Pause menu title
-            pause_title = self.get_font(60).render("PAUSED", True, "white")
-            pause_rect = pause_title.get_rect(center=(WIDTH//2, 150))
-            self.screen.blit(pause_title, pause_rect)
-
-            resume_button = Button((WIDTH//2, 250), "RESUME", self.get_font(50), "white", "green")
-            menu_button = Button((WIDTH//2, 400), "MENU", self.get_font(50), "white", "yellow")
-
-            for button in [resume_button, menu_button]:
-                button.change_color(mouse_pos)
-                button.draw(self.screen)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    return "RESUME"
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if resume_button.check_click(mouse_pos):
-                        return "RESUME"
-                    if menu_button.check_click(mouse_pos):
-                        return "MENU"
-
-            pygame.display.update()
-
-    def show_levels_menu(self):
-        while True:
-            self.screen.fill("black")
-            mouse_pos = pygame.mouse.get_pos()
-
-            title = self.get_font(80).render("LEVELS", True, TEXT_COLOR_SELECTED)
-            title_rect = title.get_rect(center=(WIDTH//2, 100))
-            self.screen.blit(title, title_rect)
-
-            # Placeholder buttons for levels
-            trial_button = Button((WIDTH//2, 200), "TRIAL", self.get_font(50), "white", "green")
-            level1_button = Button((WIDTH//2, 300), "LEVEL 1", self.get_font(50), "white", "blue")
-            level2_button = Button((WIDTH//2, 400), "LEVEL 2", self.get_font(50), "white", "blue")
-            back_button = Button((WIDTH//2, 600), "BACK", self.get_font(50), "white", "red")
-
-            for button in [trial_button, level1_button, level2_button, back_button]:
-                button.change_color(mouse_pos)
-                button.draw(self.screen)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if trial_button.check_click(mouse_pos):
-                        return "TRIAL"
-                    if level1_button.check_click(mouse_pos):
-                        return "LEVEL_1"
-                    if level2_button.check_click(mouse_pos):
-                        return "LEVEL_2"
-                    if back_button.check_click(mouse_pos):
-                        return "BACK"
-
-            pygame.display.update()
-
-
-
-
-
-
+        return asset_manager.font(MENU_FONT, size)
+
+    def main_scene(self):
+        title_rect = self.main_title_rect
+        return MenuScene(self.background, [("PLAY", self.play_button), ("LEVELS", self.levels_button), ("QUIT", self.quit_button)],
+                         titles=[(self.main_title_shadow, (title_rect.x + 3, title_rect.y + 3)), (self.main_title, title_rect)],
+                         camera=self.camera)
+
+    def pause_scene(self, frozen_surface=None):
+        # The frozen game screen is darkened once here instead of every frame
+        background = dimmed_overlay(frozen_surface) if frozen_surface else "gray"
+        return MenuScene(background, [("RESUME", self.resume_button), ("MENU", self.menu_button)],
+                         titles=[(self.pause_title, self.pause_rect)], back_action="RESUME", camera=self.camera)
+
+    def levels_scene(self):
+        return MenuScene("black", self.level_buttons + [("BACK", self.back_button)],
+                         titles=[(self.levels_title, self.levels_title_rect)], back_action="BACK", camera=self.camera)
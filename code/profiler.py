@@ -0,0 +1,95 @@
+import time
+from collections import deque
+from contextlib import nullcontext
+
+from settings import PERF_HISTORY, PERF_RATE_WINDOW
+
+# This code is used for the performance overlay: where the time of each frame goes.
+# Code wraps its work in `with frame_profiler.section('name'):`. While the overlay is off, section()
+# hands back one shared do-nothing context, so the timers cost a method call and nothing is recorded.
+# Sections can be nested, a nested one is recorded as 'outer/inner'.
+
+_NO_SECTION = nullcontext()
+
+
+class _Section:
+    __slots__ = ('profiler', 'name', 'key', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        profiler._stack.append(self.name)
+        self.key = '/'.join(profiler._stack)
+        profiler._current.setdefault(self.key, 0.0)  # Sections are listed in the order they start
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.profiler._stack.pop()
+        self.profiler._current[self.key] += elapsed
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, history=PERF_HISTORY, rate_window=PERF_RATE_WINDOW):
+        self.enabled = False
+        self.frame_times = deque(maxlen=history)  # Seconds between the starts of consecutive frames
+        self.sections = deque(maxlen=history)     # {section: seconds} of each finished frame
+        self.rate_window = rate_window
+        self._events = {}       # counter name -> deque of perf_counter times, for rates
+        self._current = {}
+        self._stack = []
+        self._frame_start = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_times.clear()
+        self.sections.clear()
+        self._events.clear()
+        self._frame_start = None
+
+    def section(self, name):
+        if not self.enabled:
+            return _NO_SECTION
+        return _Section(self, name)
+
+    def count(self, name):
+        """Notes that something happened now (e.g. a model inference), see rate()."""
+        if self.enabled:
+            self._events.setdefault(name, deque()).append(time.perf_counter())
+
+    def rate(self, name):
+        """How many times per second count(name) was called over the last rate_window seconds."""
+        events = self._events.get(name)
+        if not events:
+            return 0.0
+        horizon = time.perf_counter() - self.rate_window
+        while events and events[0] < horizon:
+            events.popleft()
+        return len(events) / self.rate_window
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.frame_times.append(now - self._frame_start)
+            self.sections.append(self._current)
+        self._frame_start = now
+        self._current = {}
+        self._stack.clear()
+
+    def average_sections(self):
+        """[(section, mean seconds per frame)] over the kept history, in the order the sections run."""
+        totals = {}
+        for frame in self.sections:
+            for name, seconds in frame.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        count = max(len(self.sections), 1)
+        return [(name, seconds / count) for name, seconds in totals.items()]
+
+
+frame_profiler = FrameProfiler()
@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Replays run without a window or sound card, so this has to happen before pygame is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from game_clock import game_clock
+from gesture_input import DwellGestureInput, NO_FRAME
+
+# Input recording and replay, for reproducing gameplay and dwell bugs without doing the gestures again.
+# While recording (python code/main.py --record session.jsonl) every frame's clock time, pygame events,
+# held movement keys and camera prediction are written as one JSON line. A replay
+# (python code/replay.py session.jsonl) feeds them back into a headless Game on a virtual clock,
+# as fast as the CPU allows, and compares the final state with the one saved at the end of the recording.
+
+RECORDING_VERSION = 1
+
+# Event types that reach the scenes, and the attributes they read
+RECORDED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+EVENT_ATTRIBUTES = ('key', 'mod', 'unicode', 'scancode', 'pos', 'rel', 'buttons', 'button')
+
+# Keys polled with pygame.key.get_pressed() by the player
+WATCHED_KEYS = (pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s, pygame.K_LEFT, pygame.K_a,
+                pygame.K_RIGHT, pygame.K_d, pygame.K_g)
+
+
+def game_state(game):
+    """The parts of the game a replay has to reproduce exactly."""
+    state = {
+        'sim_time': game_clock.now(),
+        'level': game.current_level_key,
+        'scenes': [type(scene).__name__ for scene in game.scenes.scenes],
+    }
+    level = game.active_level_instance
+    if level and level.player:
+        state.update(player_tile=list(level.player.tile), player_status=level.player.status,
+                     inventory=dict(level.player.inventory), items_left=sorted(map(list, level.items_by_tile)),
+                     level_complete=level.level_complete)
+    return state
+
+
+def encode_event(event):
+    return [event.type, {name: value for name, value in event.dict.items() if name in EVENT_ATTRIBUTES}]
+
+
+def decode_event(data):
+    event_type, attributes = data
+    return pygame.event.Event(event_type, {name: tuple(value) if isinstance(value, list) else value
+                                           for name, value in attributes.items()})
+
+
+class PressedKeys:
+    """Stands in for the result of pygame.key.get_pressed() during a replay."""
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class InputRecorder:
+    """Set as Game.input_source: reads the real input and writes each frame of it to a file."""
+    def __init__(self, path, seed=None):
+        self.path = path
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.time = 0.0
+        self.frame_count = 0
+        self._file = None
+        self._start = None
+        self._frame = None
+        self._keys = []
+
+    def start(self):
+        """Call once, before the first frame. Takes over the game clock's time source."""
+        random.seed(self.seed)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(json.dumps({'version': RECORDING_VERSION, 'seed': self.seed}) + '\n')
+        self._start = time.monotonic()
+        game_clock.source = self.now
+
+    def now(self):
+        return self.time
+
+    def begin_frame(self):
+        self._write_frame()
+        self.time = time.monotonic() - self._start
+        events = pygame.event.get()
+        self._frame = {'t': self.time}
+        recorded = [encode_event(event) for event in events if event.type in RECORDED_EVENTS]
+        if recorded:
+            self._frame['e'] = recorded
+        pressed = pygame.key.get_pressed()
+        keys = [key for key in WATCHED_KEYS if pressed[key]]
+        if keys != self._keys:
+            self._frame['k'] = self._keys = keys
+        return events
+
+    def end_frame(self, camera):
+        if camera and camera.last_prediction is not NO_FRAME:
+            self._frame['p'] = camera.last_prediction
+
+    def _write_frame(self):
+        if self._frame is not None:
+            self._file.write(json.dumps(self._frame, separators=(',', ':')) + '\n')
+            self.frame_count += 1
+            self._frame = None
+
+    def close(self, game):
+        """Writes the last frame and the final state the replay is checked against."""
+        if self._file is None:
+            return
+        self._write_frame()
+        self._file.write(json.dumps({'final': game_state(game)}) + '\n')
+        self._file.close()
+        self._file = None
+
+
+class ReplayCamera(DwellGestureInput):
+    """Runs the recorded predictions through the same dwell state machine as the live camera."""
+    def __init__(self):
+        super().__init__()
+        self.next_prediction = NO_FRAME
+
+    def read_prediction(self):
+        return self.next_prediction
+
+    def get_frame(self):
+        return None
+
+    def release(self):
+        pass
+
+
+class InputReplayer:
+    """Set as Game.input_source: plays a recording back one frame per Game.frame() call."""
+    def __init__(self, path, camera):
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        self.header = lines[0]
+        if self.header.get('version') != RECORDING_VERSION:
+            raise ValueError(f"{path}: unsupported recording version {self.header.get('version')}")
+        self.final_state = lines[-1]['final'] if 'final' in lines[-1] else None
+        self.frames = [line for line in lines[1:] if 'final' not in line]
+        self.camera = camera
+        self.index = 0
+        self.time = 0.0
+        self.keys = PressedKeys()
+        self._real_get_pressed = None
+
+    def start(self):
+        random.seed(self.header['seed'])
+        game_clock.source = self.now
+        self._real_get_pressed = pygame.key.get_pressed
+        pygame.key.get_pressed = self.get_pressed  # The player polls the recorded keys instead of the keyboard
+
+    def stop(self):
+        """Gives the keyboard back to pygame.key.get_pressed."""
+        if self._real_get_pressed is not None:
+            pygame.key.get_pressed = self._real_get_pressed
+            self._real_get_pressed = None
+
+    def now(self):
+        return self.time
+
+    def get_pressed(self):
+        return self.keys
+
+    def finished(self):
+        return self.index >= len(self.frames)
+
+    def begin_frame(self):
+        frame = self.frames[self.index]
+        self.index += 1
+        self.time = frame['t']
+        if 'k' in frame:
+            self.keys = PressedKeys(frame['k'])
+        self.camera.next_prediction = frame.get('p', NO_FRAME)
+        return [decode_event(event) for event in frame.get('e', ())]
+
+    def end_frame(self, camera):
+        pass
+
+
+def replay(path, draw=False):
+    """Replays a recording headless. Returns (final state, recorded final state, frames, seconds)."""
+    from main import Game  # Imported late so the SDL drivers above are already chosen
+
+    camera = ReplayCamera()
+    replayer = InputReplayer(path, camera)
+    game = Game(camera=camera, analytics=False)
+    game.input_source = replayer
+    replayer.start()
+
+    start = time.perf_counter()
+    try:
+        while not replayer.finished():
+            game.frame(draw=draw)
+    except SystemExit:
+        pass  # The recording ended with the game being closed
+    finally:
+        replayer.stop()
+    elapsed = time.perf_counter() - start
+    return game_state(game), replayer.final_state, replayer.index, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session headless and check its final state.")
+    parser.add_argument('recording', help="file written by main.py --record")
+    parser.add_argument('--draw', action='store_true', help="also draw every frame (slower)")
+    args = parser.parse_args(argv)
+
+    state, expected, frames, elapsed = replay(args.recording, draw=args.draw)
+    print(f"Replayed {frames} frames ({state['sim_time']:.1f} s of game time) in {elapsed:.2f} s")
+    print(json.dumps(state))
+    if expected is None:
+        print("The recording has no final state to compare with.")
+        return 0
+    if state != expected:
+        print("MISMATCH, recorded final state:")
+        print(json.dumps(expected))
+        return 1
+    print("Final state matches the recording.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
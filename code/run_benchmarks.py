@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+
+# The benchmarks draw to a headless display, so this has to happen before pygame is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from settings import WIDTH, HEIGHT
+from benchmarks.cases import CASE_GROUPS
+from benchmarks.runner import DEFAULT_REPEATS, DEFAULT_THRESHOLD, run_benchmarks, save_results, load_results, compare_results
+
+# Benchmarks of the game's hot paths. Run it from the repository root:
+#   python code/run_benchmarks.py --save baseline.json        record a baseline
+#   python code/run_benchmarks.py --compare baseline.json     flag cases that got slower
+# Baselines depend on the machine, compare only with one recorded on the same computer.
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the game's hot paths and compare them with a baseline.")
+    parser.add_argument('--filter', help="only run cases whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEATS, help="timed repeats per case")
+    parser.add_argument('--save', metavar='FILE', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='FILE', help="compare with a saved baseline, exit code 1 on a regression")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown before a case is flagged (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    results = run_benchmarks(CASE_GROUPS, args.filter, args.repeat)
+
+    print(f"{'case':50} {'median us':>12} {'min us':>12}")
+    for name, result in results['results'].items():
+        print(f"{name:50} {result['median_us']:12.1f} {result['min_us']:12.1f}")
+    for group, reason in results['skipped'].items():
+        print(f"skipped {group}: {reason}")
+
+    if args.save:
+        save_results(results, args.save)
+        print(f"Saved {len(results['results'])} results to {args.save}")
+
+    if args.compare:
+        rows = compare_results(results, load_results(args.compare), args.threshold)
+        print(f"\n{'case':50} {'baseline us':>12} {'now us':>12} {'change':>8}")
+        for name, base_us, now_us, ratio, verdict in rows:
+            flag = '' if verdict == 'ok' else f"  {verdict.upper()}"
+            print(f"{name:50} {base_us:12.1f} {now_us:12.1f} {ratio - 1:+8.1%}{flag}")
+        regressions = [row for row in rows if row[4] == 'regression']
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
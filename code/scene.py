@@ -0,0 +1,122 @@
+import pygame
+
+# This code is used for running menus, overlays and levels from the single loop in main.py.
+# Every screen is a Scene on a stack. Only the top scene gets events, gestures and updates, and
+# scenes report what the player chose by returning an action string that Game.handle_action follows.
+
+# Gesture labels from HandGestureCamera, the same ones that move the player
+GESTURE_UP, GESTURE_DOWN, GESTURE_RIGHT, GESTURE_LEFT = 0, 1, 2, 3
+
+
+class Scene:
+    def handle_event(self, event):
+        return None
+
+    def handle_gesture(self, action):
+        return None
+
+    def update(self):
+        return None
+
+    def draw(self, surface):
+        pass
+
+
+class SceneStack:
+    def __init__(self):
+        self.scenes = []
+
+    @property
+    def top(self):
+        return self.scenes[-1] if self.scenes else None
+
+    def push(self, scene):
+        self.scenes.append(scene)
+
+    def pop(self):
+        return self.scenes.pop() if self.scenes else None
+
+    def replace(self, scene):
+        """Drops every scene and starts over with this one, e.g. when a level starts."""
+        self.scenes = [scene]
+
+
+class MenuScene(Scene):
+    """
+    A list of buttons chosen with the mouse, the arrow keys or hand gestures
+    (UP/DOWN moves the selection, RIGHT confirms, LEFT goes back).
+    Everything it draws is built once, the background can be a prepared overlay.
+    """
+    def __init__(self, background, buttons, titles=(), back_action=None, camera=None):
+        self.background = background  # A surface, or a color to fill with
+        self.buttons = list(buttons)  # [(action, Button)]
+        self.titles = list(titles)    # [(surface, pos)]
+        self.back_action = back_action
+        self.camera = camera
+        self.selected = 0
+
+    def select(self, step):
+        if self.buttons:
+            self.selected = (self.selected + step) % len(self.buttons)
+
+    def selected_action(self):
+        return self.buttons[self.selected][0] if self.buttons else None
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            for index, (_, button) in enumerate(self.buttons):
+                if button.check_click(event.pos):
+                    self.selected = index
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            for action, button in self.buttons:
+                if button.check_click(event.pos):
+                    return action
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.select(-1)
+            elif event.key == pygame.K_DOWN:
+                self.select(1)
+            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                return self.selected_action()
+            elif event.key == pygame.K_ESCAPE:
+                return self.back_action
+        return None
+
+    def handle_gesture(self, action):
+        if action == GESTURE_UP:
+            self.select(-1)
+        elif action == GESTURE_DOWN:
+            self.select(1)
+        elif action == GESTURE_RIGHT:
+            return self.selected_action()
+        elif action == GESTURE_LEFT:
+            return self.back_action
+        return None
+
+    def draw(self, surface):
+        if isinstance(self.background, pygame.Surface):
+            surface.blit(self.background, (0, 0))
+        else:
+            surface.fill(self.background)
+        for title, pos in self.titles:
+            surface.blit(title, pos)
+
+        for index, (_, button) in enumerate(self.buttons):
+            button.set_hovered(index == self.selected)
+            button.draw(surface)
+
+        # Dwell progress under the selected button, so a gesture shows its effect before it fires
+        if self.camera and self.buttons:
+            progress = self.camera.get_dwell_progress()
+            if progress > 0:
+                bg_rect = self.buttons[self.selected][1].bg_rect
+                pygame.draw.rect(surface, 'lightgreen', (bg_rect.left, bg_rect.bottom + 4, int(bg_rect.width * progress), 6))
+
+
+def dimmed_overlay(frozen_surface, alpha=128):
+    """Returns a copy of the frozen game screen darkened once, reused by a modal scene every frame."""
+    background = frozen_surface.copy()
+    overlay = pygame.Surface(background.get_size(), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, alpha))
+    background.blit(overlay, (0, 0))
+    return background
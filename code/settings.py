@@ -1,7 +1,9 @@
 # game setup
 WIDTH    = 1280	
 HEIGHT   = 720
-FPS      = 60
+FPS      = 60 # drawing rate cap, gameplay runs at UPDATE_RATE
+UPDATE_RATE = 60 # fixed gameplay updates per second
+MAX_UPDATES_PER_FRAME = 5 # catch-up limit after a slow frame
 TILESIZE = 64
 HITBOX_OFFSET = {
 	'player': -26,
@@ -9,6 +11,57 @@ HITBOX_OFFSET = {
 	'grass': -10,
 	'invisible': 0}
 
+# animation
+ANIMATION_FRAME_MS = 150 # how long each animation frame is shown
+FADED_ALPHA = 128 # opacity of the faded animation frames
+PLAYER_WALK_ANIMATION = False # play the walk cycle after each step instead of only turning
+WALK_ANIMATION_MS = 600 # how long the walk cycle plays after a step
+PARTICLE_CAPACITY = 384 # particle slots shared by all reward effects of a level, a full pool draws in about 1 ms
+
+# audio
+SOUND_EFFECTS = {
+	'heart': 'audio/heal.wav',
+	'gesture': 'audio/hit.wav'}
+MUSIC_FILE = 'audio/main.ogg'
+MUSIC_VOLUME = 0.4
+EFFECT_VOLUME = 0.6
+
+# logging
+LOG_LEVEL = 'INFO'
+LOG_FILE = None # e.g. 'game.log' to also write the log to a file
+LOG_RATE_LIMIT = 5 # messages per template and window, the rest are counted and dropped
+LOG_RATE_WINDOW = 10.0 # seconds
+
+# session analytics
+PATIENT_ID = 'guest' # overridden with --patient <id>
+ANALYTICS_DB = 'analytics.db'
+ANALYTICS_FLUSH_INTERVAL = 5.0 # seconds between batched writes
+ANALYTICS_MIN_ABORTED_DWELL = 0.5 # seconds a gesture must be held before dropping it counts as an aborted dwell
+
+# performance overlay (F3)
+PERF_HISTORY = 120 # frames shown in the frame time graph
+PERF_RATE_WINDOW = 2.0 # seconds averaged for the inference rate
+PERF_TEXT_REFRESH = 0.5 # seconds between updates of the overlay numbers
+PERF_GRAPH_MS = 50 # frame time at the top of the graph
+
+# asset cache
+ASSET_CACHE_BUDGET = 128 * 1024 * 1024 # bytes of decoded surfaces kept by the asset manager
+TEXT_CACHE_SIZE = 256 # rendered text surfaces kept before the oldest is dropped
+MENU_FONT = 'graphics/font/joystix.ttf'
+
+# map loading
+MAP_CACHE_DIR = 'map/.cache' # compiled .npz layers, rebuilt when the source CSV changes
+MAP_BUILD_DIR = 'map/build' # validated level artifacts written by python code/compile_maps.py
+LEVELS_FILE = 'map/levels.json' # declarative level definitions
+HOT_RELOAD_INTERVAL = 0.5 # seconds between map file checks in dev mode (python code/main.py --dev)
+LEVEL_POOL_SIZE = 3 # built levels kept for restarting without rebuilding
+
+# map streaming (levels with "streaming": true)
+CHUNK_SIZE = 16 # tiles per chunk side
+CHUNK_LOAD_RADIUS = 1 # chunks kept loaded around the player's chunk
+CHUNK_LOOKAHEAD = 2 # chunks preloaded ahead in the direction of travel
+CHUNK_BUDGET = 16 # loaded chunks kept before the least recently needed one is dropped
+
 # ui 
 BAR_HEIGHT = 20
 HEALTH_BAR_WIDTH = 200
@@ -0,0 +1,269 @@
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# The soak test runs without a window or sound card, so this has to happen before pygame is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+from settings import FPS
+from game_clock import game_clock
+from gesture_input import IDLE_LABEL
+from scene import MenuScene, GESTURE_UP, GESTURE_DOWN, GESTURE_RIGHT, GESTURE_LEFT
+from replay import ReplayCamera
+
+# Long-running soak test: plays the game headless for hours of simulated time with a synthetic patient
+# that walks toward the hearts with dwell gestures, pauses and resumes, goes back to the menu and
+# restarts levels. Memory (RSS and tracemalloc) and garbage collector pauses are sampled along the
+# way and the report flags steady growth after the warm-up. Run it from the repository root:
+#   python code/soak.py --hours 4 --report soak_report.json
+# Exit code 0 means no findings, 1 that something was flagged and 2 that the run was too short to tell.
+
+GUIDANCE_GESTURES = {'UP': GESTURE_UP, 'DOWN': GESTURE_DOWN, 'RIGHT': GESTURE_RIGHT, 'LEFT': GESTURE_LEFT}
+PAUSES_PER_HOUR = 30
+RESTS_PER_HOUR = 60
+REST_SECONDS = (2, 8)
+
+WARMUP_FRACTION = 0.2          # Samples before this part of the run are not used for the growth rates,
+WARMUP_MINUTES = 10            # nor those of the first minutes, while every level is built for the first time
+TRACED_LEAK_KB_PER_HOUR = 512  # Python allocations growing faster than this after warm-up are flagged
+RSS_LEAK_MB_PER_HOUR = 8
+GC_PAUSE_WARN_MS = 1000 / FPS  # A collection longer than a frame is a visible stutter
+TOP_ALLOCATORS = 10
+
+
+def rss_bytes():
+    """Resident memory of this process, None where it cannot be read."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class GCPauseTimer:
+    """Times every garbage collection through gc.callbacks."""
+    def __init__(self):
+        self.pauses = []  # (generation, seconds) since the last take()
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pauses.append((info['generation'], time.perf_counter() - self._start))
+            self._start = None
+
+    def install(self):
+        gc.callbacks.append(self)
+
+    def remove(self):
+        gc.callbacks.remove(self)
+
+    def take(self):
+        pauses, self.pauses = self.pauses, []
+        return pauses
+
+
+class SyntheticPatient:
+    """
+    Set as Game.input_source. Advances a virtual clock by one frame per call and chooses the
+    gesture to hold from what is on screen, the dwell state machine then confirms it as usual.
+    """
+    def __init__(self, game, camera, seed=0):
+        self.game = game
+        self.camera = camera
+        self.rng = random.Random(seed)
+        self.time = 0.0
+        self.frame_seconds = 1.0 / FPS
+        self.scene = None
+        self.target_action = None
+        self.rest_until = 0.0
+        self.transitions = 0
+
+    def start(self):
+        random.seed(self.rng.random())
+        game_clock.source = self.now
+
+    def now(self):
+        return self.time
+
+    def choose_menu_action(self, scene):
+        actions = [action for action, _ in scene.buttons if action != "QUIT"]
+        if "RESUME" in actions:
+            return "RESUME" if self.rng.random() < 0.7 else "MENU"
+        if "LEVEL_COMPLETE_PROCEED" in actions:
+            return "LEVEL_COMPLETE_PROCEED"
+        return self.rng.choice(actions)
+
+    def begin_frame(self):
+        self.time += self.frame_seconds
+        events = []
+        scene = self.game.scenes.top
+        if scene is not self.scene:
+            self.scene = scene
+            self.transitions += 1
+            self.target_action = self.choose_menu_action(scene) if isinstance(scene, MenuScene) else None
+
+        if isinstance(scene, MenuScene):
+            # Move the selection to the chosen button, then confirm it
+            prediction = GESTURE_RIGHT if scene.selected_action() == self.target_action else GESTURE_DOWN
+        elif self.time < self.rest_until:
+            prediction = IDLE_LABEL
+        elif self.rng.random() < PAUSES_PER_HOUR / 3600 * self.frame_seconds:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0, unicode='\x1b', scancode=41))
+            prediction = IDLE_LABEL
+        elif self.rng.random() < RESTS_PER_HOUR / 3600 * self.frame_seconds:
+            self.rest_until = self.time + self.rng.uniform(*REST_SECONDS)
+            prediction = IDLE_LABEL
+        else:
+            guidance = scene.guidance() if hasattr(scene, 'guidance') else None
+            prediction = GUIDANCE_GESTURES[guidance[0]] if guidance else self.rng.choice(list(GUIDANCE_GESTURES.values()))
+        self.camera.next_prediction = prediction
+        return events
+
+    def end_frame(self, camera):
+        pass
+
+
+def growth_per_hour(hours, values):
+    """Slope of a least-squares line through the samples, in units per simulated hour."""
+    if len(values) < 2 or hours[-1] == hours[0]:
+        return 0.0
+    return float(np.polyfit(hours, values, 1)[0])
+
+
+def soak(hours, sample_minutes=5.0, draw_every=4, trace=True, seed=0):
+    """Plays for the given simulated hours and returns the report."""
+    from main import Game  # Imported late so the SDL drivers above are already chosen
+
+    camera = ReplayCamera()
+    game = Game(camera=camera, analytics=False)
+    patient = SyntheticPatient(game, camera, seed)
+    game.input_source = patient
+    patient.start()
+
+    gc_timer = GCPauseTimer()
+    gc_timer.install()
+    if trace:
+        tracemalloc.start()
+    frames = int(hours * 3600 * FPS)
+    sample_every = max(1, int(sample_minutes * 60 * FPS))
+    warmup_hours = max(hours * WARMUP_FRACTION, WARMUP_MINUTES / 60)
+    warmup_frame = int(warmup_hours * 3600 * FPS)
+    warmup_snapshot = None
+    samples, all_pauses = [], []
+    start = time.perf_counter()
+    try:
+        for frame in range(1, frames + 1):
+            game.frame(draw=frame % draw_every == 0)
+            if frame == warmup_frame and trace:
+                warmup_snapshot = tracemalloc.take_snapshot()
+            if frame % sample_every == 0 or frame == frames:
+                pauses = gc_timer.take()
+                all_pauses.extend(pauses)
+                rss = rss_bytes()
+                if rss is not None and trace:
+                    rss -= tracemalloc.get_tracemalloc_memory()  # Tracing's own bookkeeping is not the game's memory
+                samples.append({
+                    'sim_hours': frame / FPS / 3600,
+                    'wall_seconds': time.perf_counter() - start,
+                    'rss_mb': rss / 2 ** 20 if rss is not None else None,
+                    'traced_kb': tracemalloc.get_traced_memory()[0] / 1024 if trace else None,
+                    'gc_collections': len(pauses),
+                    'gc_max_ms': max((seconds for _, seconds in pauses), default=0.0) * 1000,
+                    'level': game.current_level_key,
+                    'scene_transitions': patient.transitions,
+                })
+        top_allocators = []
+        if trace:
+            end_snapshot = tracemalloc.take_snapshot()
+            if warmup_snapshot is not None:
+                ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+                stats = end_snapshot.filter_traces(ignore).compare_to(warmup_snapshot.filter_traces(ignore), 'lineno')
+                top_allocators = [{'where': str(stat.traceback), 'growth_kb': stat.size_diff / 1024, 'count_growth': stat.count_diff}
+                                  for stat in stats[:TOP_ALLOCATORS] if stat.size_diff > 0]
+    finally:
+        gc_timer.remove()
+        if trace:
+            tracemalloc.stop()
+
+    steady = [sample for sample in samples if sample['sim_hours'] >= warmup_hours]
+    steady_hours = [sample['sim_hours'] for sample in steady]
+    pause_ms = sorted(seconds * 1000 for _, seconds in all_pauses)
+    summary = {
+        'sim_hours': hours,
+        'wall_seconds': time.perf_counter() - start,
+        'frames': frames,
+        'scene_transitions': patient.transitions,
+        'warmup_hours': warmup_hours,
+        'steady_samples': len(steady),
+        'rss_growth_mb_per_hour': growth_per_hour(steady_hours, [s['rss_mb'] for s in steady]) if steady and steady[0]['rss_mb'] is not None else None,
+        'traced_growth_kb_per_hour': growth_per_hour(steady_hours, [s['traced_kb'] for s in steady]) if trace and steady else None,
+        'gc_collections': len(pause_ms),
+        'gc_collections_by_generation': {generation: sum(1 for g, _ in all_pauses if g == generation) for generation in range(3)},
+        'gc_max_ms': pause_ms[-1] if pause_ms else 0.0,
+        'gc_p99_ms': pause_ms[int(len(pause_ms) * 0.99)] if pause_ms else 0.0,
+    }
+    flags = []
+    if summary['traced_growth_kb_per_hour'] is not None and summary['traced_growth_kb_per_hour'] > TRACED_LEAK_KB_PER_HOUR:
+        flags.append(f"Python allocations grow {summary['traced_growth_kb_per_hour']:.0f} KB per hour after warm-up")
+    if summary['rss_growth_mb_per_hour'] is not None and summary['rss_growth_mb_per_hour'] > RSS_LEAK_MB_PER_HOUR:
+        flags.append(f"RSS grows {summary['rss_growth_mb_per_hour']:.1f} MB per hour after warm-up")
+    if summary['gc_max_ms'] > GC_PAUSE_WARN_MS:
+        flags.append(f"Longest GC pause {summary['gc_max_ms']:.1f} ms is longer than a frame")
+    return {'summary': summary, 'flags': flags, 'top_allocators': top_allocators, 'samples': samples}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play the game headless for hours of simulated time and report memory growth.")
+    parser.add_argument('--hours', type=float, default=1.0, help="simulated hours to play")
+    parser.add_argument('--sample-minutes', type=float, default=5.0, help="simulated minutes between samples")
+    parser.add_argument('--draw-every', type=int, default=4, help="draw one frame in this many (1 = every frame)")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="faster, but without allocation tracking")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--report', metavar='FILE', help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = soak(args.hours, args.sample_minutes, args.draw_every, not args.no_tracemalloc, args.seed)
+    summary = report['summary']
+    print(f"Played {summary['sim_hours']:g} h ({summary['frames']} frames, {summary['scene_transitions']} scene changes) "
+          f"in {summary['wall_seconds']:.0f} s")
+    print(f"{'sim h':>6} {'rss MB':>8} {'traced KB':>10} {'gc':>5} {'gc max ms':>9}  level")
+    for sample in report['samples']:
+        rss = f"{sample['rss_mb']:8.1f}" if sample['rss_mb'] is not None else f"{'-':>8}"
+        traced = f"{sample['traced_kb']:10.0f}" if sample['traced_kb'] is not None else f"{'-':>10}"
+        print(f"{sample['sim_hours']:6.2f} {rss} {traced} {sample['gc_collections']:5} {sample['gc_max_ms']:9.2f}  {sample['level']}")
+    print(f"GC: {summary['gc_collections']} collections, p99 {summary['gc_p99_ms']:.2f} ms, max {summary['gc_max_ms']:.2f} ms")
+    if report['top_allocators']:
+        print("Largest allocation growth since warm-up:")
+        for allocator in report['top_allocators']:
+            print(f"  {allocator['growth_kb']:10.1f} KB  {allocator['count_growth']:+7} blocks  {allocator['where']}")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    for flag in report['flags']:
+        print(f"FLAG: {flag}")
+    if report['flags']:
+        return 1
+    if summary['steady_samples'] < 2:
+        print(f"Too few samples after the {summary['warmup_hours'] * 60:.0f} minute warm-up to measure growth, run longer.")
+        return 2  # Not a pass: growth was never measured
+    print("No leaks or long GC pauses found.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,88 @@
 import pygame 
 from settings import *
 
+# Layer IDs stored next to each static obstacle hitbox
+LAYER_IDS = {'invisible': 0, 'grass': 1, 'object': 2}
+
+def tile_rect(pos,sprite_type,surface_size):
+	# Objects are drawn one tile higher so their base sits on the tile
+	if sprite_type == 'object':
+		return pygame.Rect((pos[0],pos[1] - TILESIZE),surface_size)
+	return pygame.Rect(pos,surface_size)
+
+def tile_hitbox(pos,sprite_type,surface_size):
+	return tile_rect(pos,sprite_type,surface_size).inflate(0,HITBOX_OFFSET[sprite_type])
+
 class Tile(pygame.sprite.Sprite):
-	def __init__(self,pos,groups,sprite_type,surface = pygame.Surface((TILESIZE,TILESIZE))):
+	def __init__(self,pos,groups,sprite_type,surface = None):
 		super().__init__(groups)
 		self.sprite_type = sprite_type
 		y_offset = HITBOX_OFFSET[sprite_type]
+		self.image = surface if surface is not None else pygame.Surface((TILESIZE,TILESIZE))
+		self.rect = tile_rect(pos,sprite_type,self.image.get_size())
+		self.hitbox = self.rect.inflate(0,y_offset)
+
+class StaticTile:
+	"""Drawable scenery tile without the Sprite machinery, drawn from the camera group's static list."""
+	__slots__ = ('sprite_type','image','rect','hitbox')
+
+	def __init__(self,pos,sprite_type,surface):
+		self.sprite_type = sprite_type
 		self.image = surface
-		if sprite_type == 'object':
-			self.rect = self.image.get_rect(topleft = (pos[0],pos[1] - TILESIZE))
-		else:
-			self.rect = self.image.get_rect(topleft = pos)
-		self.hitbox = self.rect.inflate(0,y_offset)
\ No newline at end of file
+		self.rect = tile_rect(pos,sprite_type,surface.get_size())
+		self.hitbox = tile_hitbox(pos,sprite_type,surface.get_size())
+
+class ObstacleStore:
+	"""Hitboxes of all static obstacles as plain rects plus the layer ID of each one."""
+	__slots__ = ('hitboxes','layer_ids')
+
+	def __init__(self):
+		self.hitboxes = []
+		self.layer_ids = bytearray()
+
+	def add(self,hitbox,sprite_type):
+		self.hitboxes.append(hitbox)
+		self.layer_ids.append(LAYER_IDS[sprite_type])
+
+	def add_boundary(self,pos):
+		# Invisible boundaries are only a rect, they carry no surface at all
+		hitbox = pygame.Rect(pos,(TILESIZE,TILESIZE)).inflate(0,HITBOX_OFFSET['invisible'])
+		self.add(hitbox,'invisible')
+		return hitbox
+
+	def remove(self,hitbox):
+		# Rects compare by value, so look for this exact object to keep layer_ids aligned
+		for index,stored in enumerate(self.hitboxes):
+			if stored is hitbox:
+				del self.hitboxes[index]
+				del self.layer_ids[index]
+				return
+
+	def collides(self,rect):
+		return rect.collidelist(self.hitboxes) != -1
+
+	def __len__(self):
+		return len(self.hitboxes)
+
+class ChunkedObstacleStore:
+	"""Obstacle hitboxes of the loaded chunks of a streamed map, one ObstacleStore per chunk."""
+	__slots__ = ('chunks',)
+
+	def __init__(self):
+		self.chunks = {}
+
+	def chunk_store(self,chunk):
+		return self.chunks.setdefault(chunk,ObstacleStore())
+
+	def remove_chunk(self,chunk):
+		self.chunks.pop(chunk,None)
+
+	@property
+	def hitboxes(self):
+		return [hitbox for store in self.chunks.values() for hitbox in store.hitboxes]
+
+	def collides(self,rect):
+		return any(store.collides(rect) for store in self.chunks.values())
+
+	def __len__(self):
+		return sum(len(store) for store in self.chunks.values())
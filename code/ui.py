@@ -1,24 +1,28 @@
 import pygame
 import math
+import time
 from settings import *
+from assets import asset_manager
 
-from camera import HandGestureCamera
+from game_log import get_logger
+from profiler import frame_profiler
+
+log = get_logger(__name__)
 
 class UI:
     def __init__(self):
-        self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.Font(None, 30)
+        self.font = asset_manager.font(None, 30)
         
         # Load item graphics
         self.item_graphics = {}
         for item in ITEM_TYPES:
             try:
                 # Assuming all items for now use the heart graphic for simplicity
+                # The asset manager returns the same cached surface for every item type
                 graphic_path = 'graphics/items/heart.png'
-                self.item_graphics[item] = pygame.image.load(graphic_path).convert_alpha()
-                self.item_graphics[item] = pygame.transform.scale(self.item_graphics[item], (50, 50))
+                self.item_graphics[item] = asset_manager.scaled(graphic_path, (50, 50))
             except Exception as e:
-                print(f"Could not load graphic for {item}: {e}. Creating placeholder.")
+                log.error("Could not load graphic for %s: %s. Creating placeholder.", item, e)
                 surf = pygame.Surface((32, 32))
                 surf.fill('red')
                 self.item_graphics[item] = surf
@@ -33,6 +37,14 @@ class UI:
         self.clock_fg_color = '#00FF7F' # SpringGreen
         self.clock_width = 6
 
+        # Performance overlay, its numbers are rendered again only every PERF_TEXT_REFRESH seconds
+        self.perf_font = asset_manager.font(None, 20)
+        self.perf_panel = None
+        self.perf_panel_time = 0.0
+        self.perf_graph_size = (PERF_HISTORY * 2, 60)
+        self.perf_graph_bg = pygame.Surface(self.perf_graph_size, pygame.SRCALPHA)
+        self.perf_graph_bg.fill((0, 0, 0, 170))
+
     def set_camera(self, camera_instance):
         """Sets the camera instance to be used by the UI."""
         self.camera_object = camera_instance
@@ -41,23 +53,24 @@ class UI:
         """Toggles the visibility of the camera feed."""
         self.show_camera_feed = not self.show_camera_feed
 
-    def display_camera_feed(self):
+    def display_camera_feed(self, surface):
         """Displays the camera feed in the top-right corner."""
         if self.camera_object and self.show_camera_feed:
             try:
-                cam_surface = self.camera_object.get_frame()
+                with frame_profiler.section('camera_feed'):
+                    cam_surface = self.camera_object.get_frame()
                 if cam_surface:
-                    cam_rect = cam_surface.get_rect(topright=(self.display_surface.get_width() - 10, 10))
-                    self.display_surface.blit(cam_surface, cam_rect)
-                    pygame.draw.rect(self.display_surface, (255, 255, 255), cam_rect, 2)
+                    cam_rect = cam_surface.get_rect(topright=(surface.get_width() - 10, 10))
+                    surface.blit(cam_surface, cam_rect)
+                    pygame.draw.rect(surface, (255, 255, 255), cam_rect, 2)
                     
                     # Return the rect so the dwell clock can position itself
                     return cam_rect
             except Exception as e:
-                print(f"Error displaying camera feed: {e}")
+                log.warning("Error displaying camera feed: %s", e)
         return None
 
-    def display_dwell_clock(self, camera_rect):
+    def display_dwell_clock(self, surface, camera_rect):
         """
         Displays a circular progress bar under the camera feed to show dwell time.
         """
@@ -68,20 +81,20 @@ class UI:
                 clock_center = (camera_rect.centerx, camera_rect.bottom + self.clock_radius + 15)
                 
                 # Draw the background circle
-                pygame.draw.circle(self.display_surface, self.clock_bg_color, clock_center, self.clock_radius, self.clock_width)
+                pygame.draw.circle(surface, self.clock_bg_color, clock_center, self.clock_radius, self.clock_width)
                 
                 # Draw the foreground arc
                 if progress < 1.0:
                     start_angle = math.pi / 2
                     end_angle = start_angle - (progress * 2 * math.pi)
-                    pygame.draw.arc(self.display_surface, self.clock_fg_color, 
+                    pygame.draw.arc(surface, self.clock_fg_color, 
                                     (clock_center[0] - self.clock_radius, clock_center[1] - self.clock_radius, self.clock_radius * 2, self.clock_radius * 2), 
                                     end_angle, start_angle, self.clock_width)
                 else: # Draw full circle when complete
-                    pygame.draw.circle(self.display_surface, self.clock_fg_color, clock_center, self.clock_radius, self.clock_width)
+                    pygame.draw.circle(surface, self.clock_fg_color, clock_center, self.clock_radius, self.clock_width)
 
 
-    def show_inventory(self, inventory, target):
+    def show_inventory(self, surface, inventory, target):
         """Displays the player's inventory."""
         x, y = 20, 20
         for index, (item, amount) in enumerate(inventory.items()):
@@ -91,33 +104,93 @@ class UI:
                 
                 # Background box for the item icon
                 bg_rect = item_rect.inflate(20, 20)
-                pygame.draw.rect(self.display_surface, UI_BG_COLOR, bg_rect, border_radius=5)
+                pygame.draw.rect(surface, UI_BG_COLOR, bg_rect, border_radius=5)
                 
                 # Blit the item icon
-                self.display_surface.blit(item_image, item_rect)
+                surface.blit(item_image, item_rect)
                 
                 # Border for the item icon
-                pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, bg_rect, 3, border_radius=5)
+                pygame.draw.rect(surface, UI_BORDER_COLOR, bg_rect, 3, border_radius=5)
                 
                 # --- Amount text with its own background ---
                 display_text = f'{amount} / {target}'
-                amount_text = self.font.render(display_text, False, TEXT_COLOR)
+                amount_text = asset_manager.text(self.font, display_text, TEXT_COLOR, False)
                 amount_rect = amount_text.get_rect(midleft=(item_rect.right + 10, item_rect.centery))
 
                 # Create and draw the background for the text
                 bg_text_rect = amount_rect.inflate(10, 10)
-                pygame.draw.rect(self.display_surface, UI_BG_COLOR, bg_text_rect, border_radius=5)
+                pygame.draw.rect(surface, UI_BG_COLOR, bg_text_rect, border_radius=5)
                 
                 # Draw the text itself
-                self.display_surface.blit(amount_text, amount_rect)
+                surface.blit(amount_text, amount_rect)
 
                 # Draw the border for the text's background
-                pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, bg_text_rect, 3, border_radius=5)
+                pygame.draw.rect(surface, UI_BORDER_COLOR, bg_text_rect, 3, border_radius=5)
 
-    def display(self, player, target):
-        """Displays all UI elements."""
+    def show_guidance(self, surface, guidance, top):
+        """Displays a hint toward the nearest heart below the inventory."""
+        direction, moves = guidance
+        hint_text = asset_manager.text(self.font, f'Nearest heart: {direction} ({moves} moves)', TEXT_COLOR, False)
+        hint_rect = hint_text.get_rect(topleft=(20, top))
+        bg_rect = hint_rect.inflate(10, 10)
+        pygame.draw.rect(surface, UI_BG_COLOR, bg_rect, border_radius=5)
+        surface.blit(hint_text, hint_rect)
+        pygame.draw.rect(surface, UI_BORDER_COLOR, bg_rect, 3, border_radius=5)
+
+    def display(self, surface, player, target, guidance=None):
+        """Displays all UI elements on surface."""
         if player and hasattr(player, 'inventory'):
-            self.show_inventory(player.inventory, target)
+            self.show_inventory(surface, player.inventory, target)
+            if guidance:
+                self.show_guidance(surface, guidance, 30 + len(player.inventory) * 60)
         
-        camera_rect = self.display_camera_feed()
-        self.display_dwell_clock(camera_rect)
+        camera_rect = self.display_camera_feed(surface)
+        self.display_dwell_clock(surface, camera_rect)
+
+    def perf_lines(self, counters):
+        frame_times = frame_profiler.frame_times
+        if not frame_times:
+            return ["measuring..."]
+        mean_ms = sum(frame_times) / len(frame_times) * 1000
+        lines = [f"frame {mean_ms:.1f} ms  max {max(frame_times) * 1000:.1f} ms  ({1000 / mean_ms:.0f} fps)"]
+        for name, seconds in frame_profiler.average_sections():
+            label = '  ' * (name.count('/') + 1) + name.rpartition('/')[2]
+            lines.append(f"{label:<16} {seconds * 1000:6.2f} ms")
+        lines.append(f"inference {frame_profiler.rate('inference'):.1f}/s")
+        lines.append(f"image cache {asset_manager.hit_ratio():.0%}  text cache {asset_manager.text_hit_ratio():.0%}")
+        lines.append("  ".join(f"{name} {value}" for name, value in counters.items()))
+        return lines
+
+    def display_perf_overlay(self, surface, counters):
+        """Frame time graph and per-section breakdown of the last frames, toggled with F3."""
+        now = time.perf_counter()
+        if self.perf_panel is None or now - self.perf_panel_time >= PERF_TEXT_REFRESH:
+            self.perf_panel_time = now
+            # Rendered with the font directly, changing numbers would only fill the text cache
+            rendered = [self.perf_font.render(line, True, TEXT_COLOR) for line in self.perf_lines(counters)]
+            width = max(line.get_width() for line in rendered) + 12
+            height = sum(line.get_height() for line in rendered) + 12
+            self.perf_panel = pygame.Surface((max(width, self.perf_graph_size[0]), height), pygame.SRCALPHA)
+            self.perf_panel.fill((0, 0, 0, 170))
+            y = 6
+            for line in rendered:
+                self.perf_panel.blit(line, (6, y))
+                y += line.get_height()
+
+        graph_width, graph_height = self.perf_graph_size
+        left = 10
+        panel_top = surface.get_height() - self.perf_panel.get_height() - 10
+        graph_top = panel_top - graph_height - 4
+        surface.blit(self.perf_panel, (left, panel_top))
+        surface.blit(self.perf_graph_bg, (left, graph_top))
+
+        # One bar per frame, the full height is PERF_GRAPH_MS, the line marks the frame budget
+        budget = 1 / FPS
+        bottom = graph_top + graph_height - 1
+        for index, seconds in enumerate(frame_profiler.frame_times):
+            bar = min(int(seconds * 1000 / PERF_GRAPH_MS * graph_height), graph_height)
+            color = 'green' if seconds <= budget * 1.1 else 'yellow' if seconds <= budget * 2 else 'red'
+            x = left + index * 2
+            pygame.draw.line(surface, color, (x, bottom), (x, bottom - bar))
+        budget_y = bottom - int(budget * 1000 / PERF_GRAPH_MS * graph_height)
+        pygame.draw.line(surface, 'white', (left, budget_y), (left + graph_width, budget_y))
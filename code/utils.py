@@ -2,6 +2,7 @@ import os
 import pygame
 from csv import reader
 from settings import *
+from assets import asset_manager
 
 def import_csv_layout(path):
     """Import CSV layout for map creation"""
@@ -27,11 +28,7 @@ def import_folder(path):
     """Import all images from a folder"""
     surface_list = []
     if os.path.exists(path):
-        for _, __, img_files in os.walk(path):
-            for image in img_files:
-                full_path = path + '/' + image
-                image_surf = pygame.image.load(full_path).convert_alpha()
-                surface_list.append(image_surf)
+        surface_list = asset_manager.folder(path)
     else:
         # Create default surfaces if folder doesn't exist
         default_surf = pygame.Surface((TILESIZE, TILESIZE))